@@ -0,0 +1,29 @@
+"""Index indexed_events for ordered window scans
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # indexed_events is written by the indexer; build without blocking it
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_indexed_events_window "
+            "ON indexed_events (created_at, block_number, event_index) "
+            "INCLUDE (event_hash)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_indexed_events_window")
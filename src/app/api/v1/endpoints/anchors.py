@@ -20,7 +20,7 @@ from pydantic import BaseModel, Field
 from app.crypto.merkle import MerkleProof, ProofElement, verify_proof
 from app.db import async_session_factory
 from app.db.repository import AnchorRepository
-from app.services.anchor_service import AnchorRecord
+from app.services.anchor_service import AnchorRecord, digest_algorithm_for
 from app.services.anchor_workflow import AnchorWorkflow
 
 logger = structlog.get_logger(__name__)
@@ -150,8 +150,8 @@ def _record_to_response(record: AnchorRecord) -> AnchorResponse:
         end_time=record.end_time,
         iota_message_id=record.iota_block_id,
         iota_network=record.iota_network,
-        explorer_url=record.explorer_url,
-        status=record.status.value,
+        explorer_url=record.block_explorer_url,
+        status=record.status,
         item_count=record.item_count,
         created_at=record.created_at,
         posted_at=record.posted_at,
@@ -389,8 +389,8 @@ async def get_anchor(anchor_id: UUID) -> AnchorDetailResponse:
                 end_time=anchor.end_time,
                 iota_message_id=anchor.iota_block_id,
                 iota_network=anchor.iota_network,
-                explorer_url=anchor.explorer_url,
-                status=anchor.status.value,
+                explorer_url=anchor.block_explorer_url,
+                status=anchor.status,
                 item_count=anchor.item_count,
                 created_at=anchor.created_at,
                 posted_at=anchor.posted_at,
@@ -619,6 +619,7 @@ async def verify_inclusion(
                 proof_path=proof_elements,
                 root_hash=anchor.digest,
                 tree_size=anchor.item_count,
+                algorithm=digest_algorithm_for(anchor.method),
             )
 
             verified = verify_proof(proof)
@@ -642,7 +643,7 @@ async def verify_inclusion(
                 anchor_id=anchor.id,
                 anchor_digest=anchor.digest,
                 iota_message_id=anchor.iota_block_id,
-                explorer_url=anchor.explorer_url,
+                explorer_url=anchor.block_explorer_url,
                 tangle_verified=tangle_verified,
                 message=(
                     "Verification successful" if verified
@@ -41,6 +41,10 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = ""
     DB_POOL_SIZE: int = 5
     DB_POOL_MAX_OVERFLOW: int = 10
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=500,
+        description="Prepared statements cached per pooled connection",
+    )
 
     @property
     def DATABASE_URL(self) -> str:
@@ -100,6 +104,26 @@ class Settings(BaseSettings):
         default=30.0,
         description="Maximum delay between retries in seconds",
     )
+    IOTA_MAX_CONNECTIONS: int = Field(
+        default=50,
+        description="Maximum concurrent connections to the IOTA node",
+    )
+    IOTA_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        description="Idle connections kept open to the IOTA node",
+    )
+    IOTA_KEEPALIVE_EXPIRY: float = Field(
+        default=60.0,
+        description="Seconds an idle IOTA node connection is kept open",
+    )
+    IOTA_CIRCUIT_FAIL_THRESHOLD: int = Field(
+        default=5,
+        description="Consecutive IOTA failures before reconciliation backs off",
+    )
+    IOTA_CIRCUIT_RECOVERY_TIMEOUT: float = Field(
+        default=30.0,
+        description="Seconds reconciliation skips IOTA calls after tripping",
+    )
 
     # Anchor Tag Configuration
     IOTA_TAG_PREFIX: str = Field(
@@ -141,6 +165,14 @@ class Settings(BaseSettings):
     SCHEDULER_ENABLED: bool = True
     ANCHOR_SCHEDULE_HOUR: int = 0
     ANCHOR_SCHEDULE_MINUTE: int = 0
+    EVENT_QUERY_CACHE_TTL: float = Field(
+        default=30.0,
+        description="Seconds to cache last-anchor-time and event-count lookups",
+    )
+    RETRY_STATS_CACHE_TTL: float = Field(
+        default=3600.0,
+        description="Seconds to reuse an anchor's retry history between cycles",
+    )
 
     # Metrics
     METRICS_ENABLED: bool = True
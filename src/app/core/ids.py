@@ -0,0 +1,28 @@
+"""
+ARED Edge IOTA Anchor Service - Identifier Generation
+"""
+
+import os
+import time
+from uuid import UUID
+
+
+def uuid7() -> UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+
+    The 48-bit Unix millisecond timestamp leads, so new IDs sort after
+    older ones and primary key inserts stay append-mostly.
+
+    Returns:
+        Random UUID with version 7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b
+    return UUID(int=value)
@@ -10,11 +10,34 @@ import structlog
 from app.core.config import settings
 
 
+class DigestPreview:
+    """
+    Log value that renders a shortened digest.
+
+    Truncation happens only when a log line is actually rendered, so
+    filtered-out log calls do not allocate the preview string.
+    """
+
+    __slots__ = ("_digest",)
+
+    def __init__(self, digest: str) -> None:
+        self._digest = digest
+
+    def __str__(self) -> str:
+        return self._digest[:16] + "..."
+
+    __repr__ = __str__
+
+    def __structlog__(self) -> str:
+        return str(self)
+
+
 def setup_logging() -> None:
     """Configure structured logging."""
     use_json = settings.ENV == "production"
 
     processors = [
+        structlog.stdlib.filter_by_level,
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
@@ -9,8 +9,13 @@ from app.crypto.merkle import (
     MerkleProof,
     MerkleTree,
     compute_leaf_hash,
+    compute_leaf_hash_bytes,
+    compute_leaf_hash_hex,
+    compute_leaf_hash_text,
     compute_parent_hash,
+    compute_parent_hash_raw,
     verify_proof,
+    verify_proofs_batch,
 )
 
 __all__ = [
@@ -18,6 +23,11 @@ __all__ = [
     "MerkleProof",
     "MerkleNode",
     "compute_leaf_hash",
+    "compute_leaf_hash_bytes",
+    "compute_leaf_hash_text",
+    "compute_leaf_hash_hex",
     "compute_parent_hash",
+    "compute_parent_hash_raw",
     "verify_proof",
+    "verify_proofs_batch",
 ]
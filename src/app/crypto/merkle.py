@@ -11,12 +11,28 @@ The implementation follows RFC 6962 (Certificate Transparency) conventions:
 
 For odd numbers of leaves, the last leaf is promoted (not duplicated)
 to maintain a balanced tree structure.
+
+SHA-256 is the default hash function. BLAKE3 is available as an
+alternative when the optional ``blake3`` package is installed.
 """
 
 import hashlib
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from enum import StrEnum
-from typing import Any
+from typing import Any, NamedTuple
+
+try:
+    import blake3
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_BLAKE3 = False
+else:
+    _HAS_BLAKE3 = True
+
+
+# Leaf data may be any contiguous bytes-like buffer (e.g. memoryview slices
+# of an mmap); hashlib reads buffers in place, so they are never copied
+LeafData = bytes | bytearray | memoryview
 
 
 class ProofDirection(StrEnum):
@@ -42,7 +58,7 @@ class MerkleNode:
     hash: str
     left: "MerkleNode | None" = None
     right: "MerkleNode | None" = None
-    data: bytes | None = None
+    data: LeafData | None = None
     position: int | None = None
 
     @property
@@ -51,11 +67,14 @@ class MerkleNode:
         return self.left is None and self.right is None
 
 
-@dataclass
-class ProofElement:
+class ProofElement(NamedTuple):
     """
     Single element in a Merkle proof path.
 
+    A plain tuple rather than a dataclass: proofs hold one element per
+    level for every leaf, and tuples carry no per-instance dict and are
+    immutable, so elements can be shared safely.
+
     Attributes:
         hash: The sibling hash at this level
         direction: Whether sibling is LEFT or RIGHT of the path
@@ -66,7 +85,7 @@ class ProofElement:
 
     def to_dict(self) -> dict[str, str]:
         """Serialize to dictionary."""
-        return {"hash": self.hash, "direction": self.direction.value}
+        return {"hash": self.hash, "direction": self.direction}
 
     @classmethod
     def from_dict(cls, data: dict[str, str]) -> "ProofElement":
@@ -90,6 +109,9 @@ class MerkleProof:
         proof_path: List of sibling hashes with directions
         root_hash: Expected Merkle root
         tree_size: Total number of leaves in the tree
+        algorithm: Hash algorithm used to build the tree
+        layer_index: Index of the node the path ends at in a cached tree
+            layer (see MerkleTree.get_layer); None if it ends at the root
     """
 
     leaf_hash: str
@@ -97,16 +119,22 @@ class MerkleProof:
     proof_path: list[ProofElement]
     root_hash: str
     tree_size: int
+    algorithm: str = "sha256"
+    layer_index: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize proof to dictionary for storage."""
-        return {
+        data = {
             "leaf_hash": self.leaf_hash,
             "leaf_index": self.leaf_index,
             "proof_path": [e.to_dict() for e in self.proof_path],
             "root_hash": self.root_hash,
             "tree_size": self.tree_size,
+            "algorithm": self.algorithm,
         }
+        if self.layer_index is not None:
+            data["layer_index"] = self.layer_index
+        return data
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "MerkleProof":
@@ -117,6 +145,8 @@ class MerkleProof:
             proof_path=[ProofElement.from_dict(e) for e in data["proof_path"]],
             root_hash=data["root_hash"],
             tree_size=data["tree_size"],
+            algorithm=data.get("algorithm", "sha256"),
+            layer_index=data.get("layer_index"),
         )
 
     def to_compact(self) -> list[str]:
@@ -125,7 +155,7 @@ class MerkleProof:
 
         Format: ["L:hash1", "R:hash2", ...]
         """
-        return [f"{e.direction.value}:{e.hash}" for e in self.proof_path]
+        return [f"{e.direction}:{e.hash}" for e in self.proof_path]
 
     @classmethod
     def from_compact(
@@ -135,6 +165,7 @@ class MerkleProof:
         compact_path: list[str],
         root_hash: str,
         tree_size: int,
+        algorithm: str = "sha256",
     ) -> "MerkleProof":
         """Create proof from compact format."""
         proof_path = []
@@ -152,6 +183,7 @@ class MerkleProof:
             proof_path=proof_path,
             root_hash=root_hash,
             tree_size=tree_size,
+            algorithm=algorithm,
         )
 
 
@@ -159,31 +191,215 @@ class MerkleProof:
 LEAF_PREFIX = b"\x00"
 NODE_PREFIX = b"\x01"
 
+DEFAULT_ALGORITHM = "sha256"
+
+# Hash constructors by algorithm name
+HASH_ALGORITHMS: dict[str, Callable[..., Any]] = {"sha256": hashlib.sha256}
+if _HAS_BLAKE3:
+    HASH_ALGORITHMS["blake3"] = blake3.blake3
+
+# Hasher states with the domain prefix already absorbed, copied for each
+# hash instead of initialising a fresh context and re-absorbing the prefix
+_LEAF_STATES: dict[str, Any] = {
+    name: new(LEAF_PREFIX) for name, new in HASH_ALGORITHMS.items()
+}
+_NODE_STATES: dict[str, Any] = {
+    name: new(NODE_PREFIX) for name, new in HASH_ALGORITHMS.items()
+}
+
+
+def get_hasher(algorithm: str = DEFAULT_ALGORITHM) -> Callable[..., Any]:
+    """
+    Get the hash constructor for an algorithm.
+
+    Args:
+        algorithm: Algorithm name ("sha256" or "blake3")
+
+    Returns:
+        Hash constructor compatible with the hashlib interface
+
+    Raises:
+        ValueError: If the algorithm is unknown or not installed
+    """
+    try:
+        return HASH_ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}") from None
+
+
+def _prefix_state(states: dict[str, Any], algorithm: str) -> Any:
+    """Get a prefix-absorbed hasher template for an algorithm (copy before use)."""
+    try:
+        return states[algorithm]
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}") from None
+
+
+def _coerce_leaf(data: LeafData | str) -> LeafData:
+    """Convert leaf input to bytes, decoding hex strings and encoding text."""
+    if isinstance(data, str):
+        # Assume hex-encoded string
+        return bytes.fromhex(data) if all(c in "0123456789abcdefABCDEF" for c in data) else data.encode("utf-8")
+    return data
+
+
+def _leaf_digest(data: LeafData, algorithm: str = DEFAULT_ALGORITHM) -> bytes:
+    """Hash leaf data with the leaf prefix, returning the raw digest."""
+    hasher = _prefix_state(_LEAF_STATES, algorithm).copy()
+    hasher.update(data)
+    return hasher.digest()
+
+
+def _leaf_digests(
+    leaves: Sequence[LeafData],
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> bytes:
+    """Hash many leaves, returning their raw digests concatenated in order."""
+    leaf_state = _prefix_state(_LEAF_STATES, algorithm)
+    digests = []
+    for data in leaves:
+        hasher = leaf_state.copy()
+        hasher.update(data)
+        digests.append(hasher.digest())
+    return b"".join(digests)
+
+
+def _level_sizes(leaf_count: int) -> list[int]:
+    """Node counts per level, from the leaves up to the root."""
+    sizes = [leaf_count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def _hash_level(
+    buffer: bytearray,
+    src: int,
+    dst: int,
+    count: int,
+    width: int,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> None:
+    """
+    Hash one level of a flat tree buffer into the next.
+
+    Sibling digests sit next to each other, so each pair is absorbed as a
+    single ``2 * width`` slice of the buffer. An odd trailing digest is
+    promoted by copying it unchanged.
+    """
+    node_state = _prefix_state(_NODE_STATES, algorithm)
+    pair = 2 * width
+    with memoryview(buffer) as view:
+        for i in range(count // 2):
+            hasher = node_state.copy()
+            hasher.update(view[src + i * pair : src + (i + 1) * pair])
+            buffer[dst + i * width : dst + (i + 1) * width] = hasher.digest()
+    if count & 1:
+        last = src + (count - 1) * width
+        tail = dst + (count // 2) * width
+        buffer[tail : tail + width] = buffer[last : last + width]
+
+
+def compute_leaf_hash_bytes(
+    data: LeafData,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> str:
+    """
+    Compute the hash of a leaf node from raw bytes.
+
+    Args:
+        data: Leaf data (bytes or any bytes-like buffer)
+        algorithm: Hash algorithm name
+
+    Returns:
+        Hex-encoded hash
+    """
+    return _leaf_digest(data, algorithm).hex()
+
 
-def compute_leaf_hash(data: bytes | str) -> str:
+def compute_leaf_hash_text(text: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """
+    Compute the hash of a leaf node from text, encoded as UTF-8.
+
+    Args:
+        text: Leaf text
+        algorithm: Hash algorithm name
+
+    Returns:
+        Hex-encoded hash
+    """
+    return _leaf_digest(text.encode("utf-8"), algorithm).hex()
+
+
+def compute_leaf_hash_hex(hex_data: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """
+    Compute the hash of a leaf node from hex-encoded data.
+
+    Args:
+        hex_data: Hex-encoded leaf data
+        algorithm: Hash algorithm name
+
+    Returns:
+        Hex-encoded hash
+
+    Raises:
+        ValueError: If hex_data is not valid hex
+    """
+    return _leaf_digest(bytes.fromhex(hex_data), algorithm).hex()
+
+
+def compute_leaf_hash(
+    data: LeafData | str,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> str:
     """
     Compute the hash of a leaf node.
 
     Uses domain separation with 0x00 prefix to prevent
-    second preimage attacks.
+    second preimage attacks. Strings made only of hex digits are
+    decoded as hex, any other string is hashed as UTF-8 text; prefer
+    the typed compute_leaf_hash_* functions when the input type is known.
 
     Args:
         data: Leaf data (bytes or hex string)
+        algorithm: Hash algorithm name
 
     Returns:
-        Hex-encoded SHA-256 hash
+        Hex-encoded hash
     """
-    if isinstance(data, str):
-        # Assume hex-encoded string
-        data = bytes.fromhex(data) if all(c in "0123456789abcdefABCDEF" for c in data) else data.encode("utf-8")
+    return _leaf_digest(_coerce_leaf(data), algorithm).hex()
 
-    hasher = hashlib.sha256()
-    hasher.update(LEAF_PREFIX)
-    hasher.update(data)
-    return hasher.hexdigest()
 
+def compute_parent_hash_raw(
+    left: bytes,
+    right: bytes,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> bytes:
+    """
+    Compute the hash of an internal node from raw child digests.
 
-def compute_parent_hash(left_hash: str, right_hash: str) -> str:
+    Same as compute_parent_hash without the hex decoding and encoding,
+    for callers that already hold digests as bytes.
+
+    Args:
+        left: Digest of left child
+        right: Digest of right child
+        algorithm: Hash algorithm name
+
+    Returns:
+        Raw digest
+    """
+    # One update of the joined children is cheaper than two separate ones
+    hasher = _prefix_state(_NODE_STATES, algorithm).copy()
+    hasher.update(left + right)
+    return hasher.digest()
+
+
+def compute_parent_hash(
+    left_hash: str,
+    right_hash: str,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> str:
     """
     Compute the hash of an internal node.
 
@@ -192,20 +408,19 @@ def compute_parent_hash(left_hash: str, right_hash: str) -> str:
     Args:
         left_hash: Hash of left child (hex string)
         right_hash: Hash of right child (hex string)
+        algorithm: Hash algorithm name
 
     Returns:
-        Hex-encoded SHA-256 hash
+        Hex-encoded hash
     """
-    hasher = hashlib.sha256()
-    hasher.update(NODE_PREFIX)
-    hasher.update(bytes.fromhex(left_hash))
-    hasher.update(bytes.fromhex(right_hash))
-    return hasher.hexdigest()
+    return compute_parent_hash_raw(
+        bytes.fromhex(left_hash), bytes.fromhex(right_hash), algorithm
+    ).hex()
 
 
 class MerkleTree:
     """
-    Merkle tree implementation with SHA-256 hashing.
+    Merkle tree implementation with SHA-256 (default) or BLAKE3 hashing.
 
     Features:
     - Deterministic construction from ordered leaves
@@ -222,22 +437,48 @@ class MerkleTree:
         True
     """
 
-    def __init__(self, root: MerkleNode, leaves: list[MerkleNode]) -> None:
+    def __init__(
+        self,
+        buffer: bytearray,
+        leaf_count: int,
+        leaf_data: Sequence[LeafData] | None,
+        algorithm: str = DEFAULT_ALGORITHM,
+    ) -> None:
         """
         Initialize Merkle tree (internal use).
 
         Use from_leaves() or from_hashes() to construct trees.
         """
-        self._root = root
-        self._leaves = leaves
+        # All levels live back to back in one buffer, leaves first and the
+        # root last; hashes are hex-encoded only when they leave the tree.
+        self._buffer = buffer
+        self._algorithm = algorithm
+        self._width = len(buffer) // sum(_level_sizes(leaf_count))
+        self._levels: list[tuple[int, int]] = []
+        offset = 0
+        for size in _level_sizes(leaf_count):
+            self._levels.append((offset, size))
+            offset += size * self._width
+        # None when the leaf data is the leaf digest itself (raw hashes)
+        self._leaf_data = leaf_data
+        self._root_hash = buffer[-self._width :].hex()
+        self._node_levels: list[list[MerkleNode]] | None = None
 
     @classmethod
-    def from_leaves(cls, leaves: list[bytes]) -> "MerkleTree":
+    def from_leaves(
+        cls,
+        leaves: Sequence[LeafData],
+        algorithm: str = DEFAULT_ALGORITHM,
+    ) -> "MerkleTree":
         """
         Construct a Merkle tree from leaf data.
 
+        Bytes-like buffers such as memoryview slices of an mmap are hashed
+        in place, so file-backed leaves are not copied into memory.
+
         Args:
-            leaves: List of leaf data (bytes)
+            leaves: List of leaf data (bytes or bytes-like buffers)
+            algorithm: Hash algorithm name
 
         Returns:
             Constructed MerkleTree
@@ -248,22 +489,22 @@ class MerkleTree:
         if not leaves:
             raise ValueError("Cannot create Merkle tree from empty leaves")
 
-        # Create leaf nodes
-        leaf_nodes = []
-        for i, data in enumerate(leaves):
-            leaf_hash = compute_leaf_hash(data)
-            leaf_nodes.append(
-                MerkleNode(
-                    hash=leaf_hash,
-                    data=data,
-                    position=i,
-                )
-            )
-
-        return cls._build_tree(leaf_nodes)
+        # Strings are normalized once up front so the hashing pass only
+        # sees bytes
+        leaf_data = (
+            [_coerce_leaf(data) for data in leaves]
+            if any(isinstance(data, str) for data in leaves)
+            else leaves
+        )
+        digests = _leaf_digests(leaf_data, algorithm)
+        return cls._build_tree(digests, len(leaf_data), leaf_data, algorithm)
 
     @classmethod
-    def from_hashes(cls, hashes: list[str]) -> "MerkleTree":
+    def from_hashes(
+        cls,
+        hashes: list[str],
+        algorithm: str = DEFAULT_ALGORITHM,
+    ) -> "MerkleTree":
         """
         Construct a Merkle tree from pre-computed leaf hashes.
 
@@ -271,6 +512,7 @@ class MerkleTree:
 
         Args:
             hashes: List of hex-encoded leaf hashes
+            algorithm: Hash algorithm name
 
         Returns:
             Constructed MerkleTree
@@ -281,24 +523,18 @@ class MerkleTree:
         if not hashes:
             raise ValueError("Cannot create Merkle tree from empty hashes")
 
-        # Create leaf nodes from pre-hashed data
-        leaf_nodes = []
-        for i, hash_value in enumerate(hashes):
-            # For pre-hashed data, we hash again with leaf prefix
-            # to maintain consistent tree structure
-            leaf_hash = compute_leaf_hash(bytes.fromhex(hash_value))
-            leaf_nodes.append(
-                MerkleNode(
-                    hash=leaf_hash,
-                    data=bytes.fromhex(hash_value),
-                    position=i,
-                )
-            )
-
-        return cls._build_tree(leaf_nodes)
+        # For pre-hashed data, we hash again with leaf prefix
+        # to maintain consistent tree structure
+        leaf_data = [bytes.fromhex(hash_value) for hash_value in hashes]
+        digests = _leaf_digests(leaf_data, algorithm)
+        return cls._build_tree(digests, len(leaf_data), leaf_data, algorithm)
 
     @classmethod
-    def from_raw_hashes(cls, hashes: list[str]) -> "MerkleTree":
+    def from_raw_hashes(
+        cls,
+        hashes: list[str],
+        algorithm: str = DEFAULT_ALGORITHM,
+    ) -> "MerkleTree":
         """
         Construct a Merkle tree using hashes directly as leaf hashes.
 
@@ -306,6 +542,7 @@ class MerkleTree:
 
         Args:
             hashes: List of hex-encoded hashes to use directly as leaves
+            algorithm: Hash algorithm name for internal nodes
 
         Returns:
             Constructed MerkleTree
@@ -313,73 +550,96 @@ class MerkleTree:
         if not hashes:
             raise ValueError("Cannot create Merkle tree from empty hashes")
 
-        leaf_nodes = []
-        for i, hash_value in enumerate(hashes):
-            leaf_nodes.append(
-                MerkleNode(
-                    hash=hash_value,
-                    data=bytes.fromhex(hash_value),
-                    position=i,
-                )
-            )
+        width = get_hasher(algorithm)().digest_size
+        if any(len(hash_value) != 2 * width for hash_value in hashes):
+            raise ValueError(f"Raw hashes must be {width}-byte hex digests")
 
-        return cls._build_tree(leaf_nodes)
+        digests = bytes.fromhex("".join(hashes))
+        return cls._build_tree(digests, len(hashes), None, algorithm)
 
     @classmethod
-    def _build_tree(cls, leaf_nodes: list[MerkleNode]) -> "MerkleTree":
-        """Build tree from leaf nodes."""
-        if len(leaf_nodes) == 1:
-            return cls(leaf_nodes[0], leaf_nodes)
-
-        # Build tree bottom-up
-        current_level = leaf_nodes
-
-        while len(current_level) > 1:
-            next_level = []
-
-            i = 0
-            while i < len(current_level):
-                left = current_level[i]
-
-                if i + 1 < len(current_level):
-                    # Normal case: pair left and right
-                    right = current_level[i + 1]
-                    parent_hash = compute_parent_hash(left.hash, right.hash)
-                    parent = MerkleNode(
-                        hash=parent_hash,
-                        left=left,
-                        right=right,
+    def _build_tree(
+        cls,
+        leaf_digests: bytes,
+        leaf_count: int,
+        leaf_data: Sequence[LeafData] | None,
+        algorithm: str = DEFAULT_ALGORITHM,
+    ) -> "MerkleTree":
+        """Build tree from concatenated raw leaf digests."""
+        get_hasher(algorithm)
+        width = len(leaf_digests) // leaf_count
+        sizes = _level_sizes(leaf_count)
+
+        # Build tree bottom-up into one buffer, keeping every level for
+        # proof generation
+        buffer = bytearray(sum(sizes) * width)
+        buffer[: len(leaf_digests)] = leaf_digests
+        offset = 0
+        for size in sizes[:-1]:
+            _hash_level(buffer, offset, offset + size * width, size, width, algorithm)
+            offset += size * width
+
+        return cls(buffer, leaf_count, leaf_data, algorithm)
+
+    def _digest(self, level: int, index: int) -> bytes:
+        """Get the raw digest of a node by level and index."""
+        start = self._levels[level][0] + index * self._width
+        return bytes(self._buffer[start : start + self._width])
+
+    def _nodes(self) -> list[list[MerkleNode]]:
+        """Materialize the linked node view of the tree on first use."""
+        if self._node_levels is None:
+            leaf_count = self._levels[0][1]
+            leaf_digests = [self._digest(0, i) for i in range(leaf_count)]
+            leaf_data = self._leaf_data or leaf_digests
+            below = [
+                MerkleNode(hash=digest.hex(), data=data, position=i)
+                for i, (digest, data) in enumerate(
+                    zip(leaf_digests, leaf_data, strict=True)
+                )
+            ]
+            node_levels = [below]
+            for level in range(1, len(self._levels)):
+                nodes = [
+                    MerkleNode(
+                        hash=self._digest(level, i).hex(),
+                        left=below[2 * i],
+                        right=below[2 * i + 1],
                     )
-                    next_level.append(parent)
-                    i += 2
-                else:
-                    # Odd case: promote the last node
-                    next_level.append(left)
-                    i += 1
+                    for i in range(len(below) // 2)
+                ]
+                if len(below) & 1:
+                    # Odd case: the last node was promoted
+                    nodes.append(below[-1])
+                node_levels.append(nodes)
+                below = nodes
+            self._node_levels = node_levels
+        return self._node_levels
 
-            current_level = next_level
-
-        return cls(current_level[0], leaf_nodes)
+    @property
+    def algorithm(self) -> str:
+        """Get the hash algorithm name."""
+        return self._algorithm
 
     @property
     def root(self) -> MerkleNode:
         """Get the root node."""
-        return self._root
+        return self._nodes()[-1][0]
 
     @property
     def root_hash(self) -> str:
         """Get the root hash (Merkle root)."""
-        return self._root.hash
+        return self._root_hash
 
     @property
     def leaves(self) -> list[MerkleNode]:
         """Get all leaf nodes."""
-        return self._leaves
+        return self._nodes()[0]
 
     @property
     def leaf_count(self) -> int:
         """Get the number of leaves."""
-        return len(self._leaves)
+        return self._levels[0][1]
 
     def get_leaf_hash(self, index: int) -> str:
         """
@@ -394,119 +654,268 @@ class MerkleTree:
         Raises:
             IndexError: If index out of bounds
         """
-        if index < 0 or index >= len(self._leaves):
+        if index < 0 or index >= self.leaf_count:
             raise IndexError(f"Leaf index {index} out of bounds")
-        return self._leaves[index].hash
+        return self._digest(0, index).hex()
 
-    def get_proof(self, leaf_index: int) -> MerkleProof:
+    def get_layer(self, depth: int) -> list[str]:
+        """
+        Get the hashes of one tree layer, counted down from the root.
+
+        A verifier holding a layer can check proofs generated with the
+        same layer_depth, which are shorter by the layers above it.
+
+        Args:
+            depth: Layer depth (0 is the root layer)
+
+        Returns:
+            Hex-encoded node hashes of the layer, left to right
+
+        Raises:
+            ValueError: If depth is outside the tree
+        """
+        if depth < 0 or depth >= len(self._levels):
+            raise ValueError(f"Layer depth {depth} outside tree")
+        level = len(self._levels) - 1 - depth
+        return [self._digest(level, i).hex() for i in range(self._levels[level][1])]
+
+    def get_proof(self, leaf_index: int, layer_depth: int = 0) -> MerkleProof:
         """
         Generate inclusion proof for a leaf.
 
         Args:
             leaf_index: Index of the leaf to prove
+            layer_depth: End the path at this layer below the root instead
+                of at the root (see get_layer)
 
         Returns:
             MerkleProof for the leaf
 
         Raises:
             IndexError: If leaf_index out of bounds
+            ValueError: If layer_depth is outside the tree
         """
-        if leaf_index < 0 or leaf_index >= len(self._leaves):
+        if leaf_index < 0 or leaf_index >= self.leaf_count:
             raise IndexError(f"Leaf index {leaf_index} out of bounds")
+        if layer_depth < 0 or layer_depth >= len(self._levels):
+            raise ValueError(f"Layer depth {layer_depth} outside tree")
 
+        # A node's index at level l is leaf_index >> l; its sibling is
+        # index ^ 1 unless the node was promoted as the odd one out.
         proof_path = []
-        current_index = leaf_index
-        current_level = self._leaves
-
-        while len(current_level) > 1:
-            next_level = []
-            i = 0
-
-            while i < len(current_level):
-                if i + 1 < len(current_level):
-                    left = current_level[i]
-                    right = current_level[i + 1]
-
-                    # Check if current node is in this pair
-                    if i == current_index:
-                        # Current is left, sibling is right
-                        proof_path.append(
-                            ProofElement(
-                                hash=right.hash,
-                                direction=ProofDirection.RIGHT,
-                            )
-                        )
-                        current_index = len(next_level)
-                    elif i + 1 == current_index:
-                        # Current is right, sibling is left
-                        proof_path.append(
-                            ProofElement(
-                                hash=left.hash,
-                                direction=ProofDirection.LEFT,
-                            )
-                        )
-                        current_index = len(next_level)
-
-                    parent_hash = compute_parent_hash(left.hash, right.hash)
-                    next_level.append(MerkleNode(hash=parent_hash))
-                    i += 2
-                else:
-                    # Odd element - promoted
-                    if i == current_index:
-                        current_index = len(next_level)
-                    next_level.append(current_level[i])
-                    i += 1
-
-            current_level = next_level
+        index = leaf_index
+        top = len(self._levels) - 1 - layer_depth
+
+        for level, (_, size) in enumerate(self._levels[:top]):
+            sibling = index ^ 1
+            if sibling < size:
+                proof_path.append(
+                    ProofElement(
+                        hash=self._digest(level, sibling).hex(),
+                        direction=(
+                            ProofDirection.LEFT if index & 1 else ProofDirection.RIGHT
+                        ),
+                    )
+                )
+            index >>= 1
 
         return MerkleProof(
-            leaf_hash=self._leaves[leaf_index].hash,
+            leaf_hash=self._digest(0, leaf_index).hex(),
             leaf_index=leaf_index,
             proof_path=proof_path,
-            root_hash=self.root_hash,
-            tree_size=len(self._leaves),
+            root_hash=self._root_hash,
+            tree_size=self.leaf_count,
+            algorithm=self._algorithm,
+            layer_index=index if layer_depth else None,
         )
 
+    def _sibling_sweep(self) -> Iterator[tuple[ProofDirection, str, range]]:
+        """
+        Walk each level once, yielding every proof entry with its leaves.
+
+        Yields (direction, sibling hash, leaf range) for each sibling
+        entry, where the range covers every leaf whose proof contains it.
+        Entries come out level by level, so appending them in order
+        builds each leaf's proof path from the bottom up.
+        """
+        leaf_count = self.leaf_count
+
+        for depth, (_, size) in enumerate(self._levels[:-1]):
+            span = 1 << depth
+            for i in range(0, size - 1, 2):
+                # Leaves under node i at this depth: [i * span, (i + 1) * span)
+                left_start = i * span
+                right_start = left_start + span
+                right_end = min(right_start + span, leaf_count)
+
+                yield (
+                    ProofDirection.RIGHT,
+                    self._digest(depth, i + 1).hex(),
+                    range(left_start, right_start),
+                )
+                yield (
+                    ProofDirection.LEFT,
+                    self._digest(depth, i).hex(),
+                    range(right_start, right_end),
+                )
+
     def get_all_proofs(self) -> list[MerkleProof]:
         """
-        Generate proofs for all leaves.
+        Generate proofs for all leaves in a single sweep.
 
         Returns:
             List of MerkleProof for each leaf
         """
-        return [self.get_proof(i) for i in range(len(self._leaves))]
+        paths: list[list[ProofElement]] = [[] for _ in range(self.leaf_count)]
+
+        # Elements are immutable, so every proof through a node shares one
+        for direction, sibling_hash, leaves in self._sibling_sweep():
+            element = ProofElement(hash=sibling_hash, direction=direction)
+            for leaf in leaves:
+                paths[leaf].append(element)
+
+        return [
+            MerkleProof(
+                leaf_hash=self._digest(0, i).hex(),
+                leaf_index=i,
+                proof_path=path,
+                root_hash=self._root_hash,
+                tree_size=self.leaf_count,
+                algorithm=self._algorithm,
+            )
+            for i, path in enumerate(paths)
+        ]
+
+    def get_all_compact_proofs(self) -> list[list[str]]:
+        """
+        Generate compact proofs for all leaves in a single sweep.
+
+        Walks each level once and appends every sibling entry to the
+        proof of each leaf below it, instead of walking the tree per leaf.
+
+        Returns:
+            Compact proof paths (see MerkleProof.to_compact) by leaf index
+        """
+        paths: list[list[str]] = [[] for _ in range(self.leaf_count)]
+
+        for direction, sibling_hash, leaves in self._sibling_sweep():
+            item = f"{direction}:{sibling_hash}"
+            for leaf in leaves:
+                paths[leaf].append(item)
+
+        return paths
+
+
+def _proof_target(proof: MerkleProof, layer: list[str] | None) -> str | None:
+    """Get the hash a proof path must reach: its layer node or the root."""
+    if proof.layer_index is None:
+        return proof.root_hash
+    if layer is None or not 0 <= proof.layer_index < len(layer):
+        return None
+    return layer[proof.layer_index]
+
+
+def _fold_path(
+    leaf_hash: str,
+    proof_path: list[ProofElement],
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> bytes:
+    """
+    Hash a leaf up its proof path, returning the raw digest reached.
 
+    Works on raw digests throughout: each hash is decoded from hex once
+    and parents are never re-encoded between levels.
+    """
+    node_state = _prefix_state(_NODE_STATES, algorithm)
+    left_side = ProofDirection.LEFT
+    current = bytes.fromhex(leaf_hash)
+
+    for sibling_hash, direction in proof_path:
+        sibling = bytes.fromhex(sibling_hash)
+        hasher = node_state.copy()
+        if direction == left_side:
+            # Sibling is on the left
+            hasher.update(sibling + current)
+        else:
+            # Sibling is on the right
+            hasher.update(current + sibling)
+        current = hasher.digest()
 
-def verify_proof(proof: MerkleProof) -> bool:
+    return current
+
+
+def verify_proof(proof: MerkleProof, layer: list[str] | None = None) -> bool:
     """
     Verify a Merkle inclusion proof.
 
     Reconstructs the root hash from the leaf hash and proof path,
-    then compares with the expected root.
+    then compares with the expected root. Proofs ending at a cached
+    layer are compared with that layer's node instead.
 
     Args:
         proof: MerkleProof to verify
+        layer: Layer hashes from MerkleTree.get_layer, required when the
+            proof has a layer_index
 
     Returns:
         True if proof is valid
     """
-    current_hash = proof.leaf_hash
+    target = _proof_target(proof, layer)
+    if target is None:
+        return False
 
-    for element in proof.proof_path:
-        if element.direction == ProofDirection.LEFT:
-            # Sibling is on the left
-            current_hash = compute_parent_hash(element.hash, current_hash)
-        else:
-            # Sibling is on the right
-            current_hash = compute_parent_hash(current_hash, element.hash)
+    root = _fold_path(proof.leaf_hash, proof.proof_path, proof.algorithm)
+    return root.hex() == target
+
+
+def verify_proofs_batch(
+    proofs: Iterable[MerkleProof],
+    layer: list[str] | None = None,
+) -> list[bool]:
+    """
+    Verify many Merkle inclusion proofs.
+
+    Proofs drawn from the same tree share their upper path, so each
+    distinct parent is hashed once for the whole batch and reused.
 
-    return current_hash == proof.root_hash
+    Args:
+        proofs: MerkleProofs to verify
+        layer: Layer hashes for proofs with a layer_index (see verify_proof)
+
+    Returns:
+        Verification result for each proof, in order
+    """
+    parents: dict[tuple[str, bytes, bytes], bytes] = {}
+    left_side = ProofDirection.LEFT
+    results = []
+
+    for proof in proofs:
+        target = _proof_target(proof, layer)
+        if target is None:
+            results.append(False)
+            continue
+        current = bytes.fromhex(proof.leaf_hash)
+        for sibling_hash, direction in proof.proof_path:
+            sibling = bytes.fromhex(sibling_hash)
+            if direction == left_side:
+                key = (proof.algorithm, sibling, current)
+            else:
+                key = (proof.algorithm, current, sibling)
+            parent = parents.get(key)
+            if parent is None:
+                parent = compute_parent_hash_raw(key[1], key[2], key[0])
+                parents[key] = parent
+            current = parent
+        results.append(current.hex() == target)
+
+    return results
 
 
 def verify_proof_against_root(
     leaf_hash: str,
     proof_path: list[ProofElement],
     expected_root: str,
+    algorithm: str = DEFAULT_ALGORITHM,
 ) -> bool:
     """
     Verify a proof against a specific root hash.
@@ -515,38 +924,28 @@ def verify_proof_against_root(
         leaf_hash: Hash of the leaf
         proof_path: List of proof elements
         expected_root: Expected Merkle root
+        algorithm: Hash algorithm name
 
     Returns:
         True if proof reconstructs to expected root
     """
-    current_hash = leaf_hash
+    return _fold_path(leaf_hash, proof_path, algorithm).hex() == expected_root
 
-    for element in proof_path:
-        if element.direction == ProofDirection.LEFT:
-            current_hash = compute_parent_hash(element.hash, current_hash)
-        else:
-            current_hash = compute_parent_hash(current_hash, element.hash)
-
-    return current_hash == expected_root
 
-
-def compute_root_from_proof(leaf_hash: str, proof_path: list[ProofElement]) -> str:
+def compute_root_from_proof(
+    leaf_hash: str,
+    proof_path: list[ProofElement],
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> str:
     """
     Compute the root hash from a leaf and proof path.
 
     Args:
         leaf_hash: Hash of the leaf
         proof_path: List of proof elements
+        algorithm: Hash algorithm name
 
     Returns:
         Computed root hash
     """
-    current_hash = leaf_hash
-
-    for element in proof_path:
-        if element.direction == ProofDirection.LEFT:
-            current_hash = compute_parent_hash(element.hash, current_hash)
-        else:
-            current_hash = compute_parent_hash(current_hash, element.hash)
-
-    return current_hash
+    return _fold_path(leaf_hash, proof_path, algorithm).hex()
@@ -8,8 +8,9 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+import orjson
 import structlog
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.anchor_service import AnchorRecord, AnchorStatus
@@ -17,6 +18,78 @@ from app.services.anchor_service import AnchorRecord, AnchorStatus
 logger = structlog.get_logger(__name__)
 
 
+# Keyset condition for paging anchors by (created_at, id) without OFFSET scans
+_AFTER_CURSOR_SQL = "AND (a.created_at, a.id) > (:after_created_at, :after_id)"
+
+
+def _cursor_params(after: tuple[datetime, UUID] | None) -> dict[str, Any]:
+    """Bind parameters for the keyset condition, if paging past a cursor."""
+    if after is None:
+        return {}
+    return {"after_created_at": after[0], "after_id": after[1]}
+
+
+def _due_anchors_query(paged: bool) -> TextClause:
+    """Build the due-for-retry anchor listing, optionally past a cursor."""
+    return text(f"""
+        SELECT a.id, a.digest, a.method, a.start_time, a.end_time,
+               a.item_count, a.status, a.iota_block_id, a.iota_network,
+               a.explorer_url, a.error_message, a.created_at, a.posted_at,
+               a.confirmed_at,
+               rs.retries, rs.last_attempt, rs.next_retry_at
+        FROM anchors a
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS retries,
+                   MAX(l.created_at) AS last_attempt,
+                   (ARRAY_AGG(l.next_retry_at ORDER BY l.created_at DESC))[1]
+                       AS next_retry_at
+            FROM anchor_retry_log l
+            WHERE l.anchor_id = a.id
+        ) rs
+        WHERE a.status = :status
+          AND (
+              rs.last_attempt IS NULL
+              OR COALESCE(
+                  rs.next_retry_at,
+                  rs.last_attempt + LEAST(
+                      CAST(:base AS double precision) * POWER(2, rs.retries),
+                      CAST(:max_delay AS double precision)
+                  ) * INTERVAL '1 second'
+              ) <= NOW()
+          )
+          {_AFTER_CURSOR_SQL if paged else ""}
+        ORDER BY a.created_at, a.id
+        LIMIT :limit
+    """)
+
+
+def _anchors_page_query(paged: bool) -> TextClause:
+    """Build the per-status anchor page listing, optionally past a cursor."""
+    return text(f"""
+        SELECT a.id, a.digest, a.method, a.start_time, a.end_time,
+               a.item_count, a.status, a.iota_block_id, a.iota_network,
+               a.explorer_url, a.error_message, a.created_at, a.posted_at,
+               a.confirmed_at
+        FROM anchors a
+        WHERE a.status = :status
+          {_AFTER_CURSOR_SQL if paged else ""}
+        ORDER BY a.created_at, a.id
+        LIMIT :limit
+    """)
+
+
+# Built once so reconciliation paging reuses the same statements every cycle
+_Q_DUE_ANCHORS = _due_anchors_query(paged=False)
+_Q_DUE_ANCHORS_AFTER = _due_anchors_query(paged=True)
+_Q_ANCHORS_PAGE = _anchors_page_query(paged=False)
+_Q_ANCHORS_PAGE_AFTER = _anchors_page_query(paged=True)
+
+
+def _encode_proof(merkle_proof: list[str] | None) -> str | None:
+    """Encode a Merkle proof path as JSON text for a jsonb column."""
+    return orjson.dumps(merkle_proof).decode() if merkle_proof else None
+
+
 class AnchorRepository:
     """Repository for anchor-related database operations."""
 
@@ -69,7 +142,7 @@ class AnchorRepository:
                 "start_time": record.start_time,
                 "end_time": record.end_time,
                 "item_count": record.item_count,
-                "status": record.status.value,
+                "status": record.status,
                 "iota_block_id": record.iota_block_id,
                 "iota_network": record.iota_network,
                 "explorer_url": record.explorer_url,
@@ -250,6 +323,7 @@ class AnchorRepository:
         status: AnchorStatus,
         iota_block_id: str | None = None,
         error_message: str | None = None,
+        commit: bool = True,
     ) -> bool:
         """
         Update anchor status.
@@ -259,12 +333,15 @@ class AnchorRepository:
             status: New status
             iota_block_id: Optional IOTA block ID
             error_message: Optional error message
+            commit: Commit immediately; pass False to batch several updates
+                into the caller's transaction
 
         Returns:
-            True if updated successfully
+            True if updated successfully (False if the anchor is missing, or
+            already confirmed when confirming)
         """
         updates = ["status = :status"]
-        params: dict[str, Any] = {"id": anchor_id, "status": status.value}
+        params: dict[str, Any] = {"id": anchor_id, "status": status}
 
         if status == AnchorStatus.POSTED and iota_block_id:
             updates.append("iota_block_id = :iota_block_id")
@@ -272,9 +349,13 @@ class AnchorRepository:
             params["iota_block_id"] = iota_block_id
             params["posted_at"] = datetime.utcnow()
 
+        where = "id = :id"
         if status == AnchorStatus.CONFIRMED:
             updates.append("confirmed_at = :confirmed_at")
             params["confirmed_at"] = datetime.utcnow()
+            # Overlapping reconciliation runs may both see the confirmation;
+            # only the first write counts, keeping the original confirmed_at
+            where += " AND status <> :status"
 
         if status == AnchorStatus.FAILED and error_message:
             updates.append("error_message = :error_message")
@@ -283,12 +364,13 @@ class AnchorRepository:
         query = text(f"""
             UPDATE anchors
             SET {', '.join(updates)}
-            WHERE id = :id
+            WHERE {where}
             RETURNING id
         """)
 
         result = await self._session.execute(query, params)
-        await self._session.commit()
+        if commit:
+            await self._session.commit()
 
         return result.fetchone() is not None
 
@@ -313,8 +395,6 @@ class AnchorRepository:
         Returns:
             Anchor item UUID
         """
-        import json
-
         query = text("""
             INSERT INTO anchor_items (
                 anchor_id, event_id, event_hash, position_in_merkle, merkle_proof
@@ -331,13 +411,51 @@ class AnchorRepository:
                 "event_id": event_id,
                 "event_hash": event_hash,
                 "position": position,
-                "merkle_proof": json.dumps(merkle_proof) if merkle_proof else None,
+                "merkle_proof": _encode_proof(merkle_proof),
             },
         )
 
         row = result.fetchone()
         return row.id
 
+    async def save_anchor_items(
+        self,
+        anchor_id: UUID,
+        items: list[tuple[UUID | None, str, list[str] | None]],
+    ) -> None:
+        """
+        Save anchor items in a single batched insert.
+
+        Args:
+            anchor_id: Parent anchor UUID
+            items: (event_id, event_hash, merkle_proof) tuples in tree order
+        """
+        if not items:
+            return
+
+        query = text("""
+            INSERT INTO anchor_items (
+                anchor_id, event_id, event_hash, position_in_merkle, merkle_proof
+            ) VALUES (
+                :anchor_id, :event_id, :event_hash, :position,
+                CAST(:merkle_proof AS jsonb)
+            )
+        """)
+
+        await self._session.execute(
+            query,
+            [
+                {
+                    "anchor_id": anchor_id,
+                    "event_id": event_id,
+                    "event_hash": event_hash,
+                    "position": position,
+                    "merkle_proof": _encode_proof(merkle_proof),
+                }
+                for position, (event_id, event_hash, merkle_proof) in enumerate(items)
+            ],
+        )
+
     async def get_anchor_items(
         self,
         anchor_id: UUID,
@@ -417,6 +535,114 @@ class AnchorRepository:
             confirmed_at=row.confirmed_at,
         )
 
+    async def list_due_anchors(
+        self,
+        status: str,
+        base: float,
+        max_delay: float,
+        limit: int = 100,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[tuple[AnchorRecord, int, datetime | None, datetime | None]]:
+        """
+        List anchors whose retry backoff has elapsed, oldest first.
+
+        An anchor is due if it has never been retried, or if its stored
+        next_retry_at (or, for older attempts, last attempt plus the capped
+        exponential delay) has passed.
+
+        Args:
+            status: Status filter
+            base: Base retry delay in seconds
+            max_delay: Maximum retry delay in seconds
+            limit: Maximum records to return
+            after: (created_at, id) of the last anchor on the previous page
+
+        Returns:
+            (record, retries, last_attempt, next_retry_at) tuples
+        """
+        query = _Q_DUE_ANCHORS_AFTER if after else _Q_DUE_ANCHORS
+        result = await self._session.execute(
+            query,
+            {
+                "status": status,
+                "base": base,
+                "max_delay": max_delay,
+                "limit": limit,
+                **_cursor_params(after),
+            },
+        )
+
+        return [
+            (
+                AnchorRecord(
+                    id=row.id,
+                    digest=row.digest,
+                    method=row.method,
+                    start_time=row.start_time,
+                    end_time=row.end_time,
+                    item_count=row.item_count,
+                    status=AnchorStatus(row.status),
+                    iota_block_id=row.iota_block_id,
+                    iota_network=row.iota_network,
+                    explorer_url=row.explorer_url,
+                    error_message=row.error_message,
+                    created_at=row.created_at,
+                    posted_at=row.posted_at,
+                    confirmed_at=row.confirmed_at,
+                ),
+                row.retries,
+                row.last_attempt,
+                row.next_retry_at,
+            )
+            for row in result.fetchall()
+        ]
+
+    async def list_anchors_page(
+        self,
+        status: str,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int = 500,
+    ) -> list[AnchorRecord]:
+        """
+        List one page of anchors with a status, oldest first.
+
+        Pages are keyed on (created_at, id), so walking a large backlog
+        costs the same per page however deep it goes.
+
+        Args:
+            status: Status filter
+            after: (created_at, id) of the last anchor on the previous page
+            limit: Maximum records to return
+
+        Returns:
+            List of AnchorRecords
+        """
+        query = _Q_ANCHORS_PAGE_AFTER if after else _Q_ANCHORS_PAGE
+        result = await self._session.execute(
+            query,
+            {"status": status, "limit": limit, **_cursor_params(after)},
+        )
+
+        return [
+            AnchorRecord(
+                id=row.id,
+                digest=row.digest,
+                method=row.method,
+                start_time=row.start_time,
+                end_time=row.end_time,
+                item_count=row.item_count,
+                status=AnchorStatus(row.status),
+                iota_block_id=row.iota_block_id,
+                iota_network=row.iota_network,
+                explorer_url=row.explorer_url,
+                error_message=row.error_message,
+                created_at=row.created_at,
+                posted_at=row.posted_at,
+                confirmed_at=row.confirmed_at,
+            )
+            for row in result.fetchall()
+        ]
+
     async def get_pending_anchors(self) -> list[AnchorRecord]:
         """
         Get anchors in pending status for retry processing.
@@ -424,7 +650,7 @@ class AnchorRepository:
         Returns:
             List of pending AnchorRecords
         """
-        return await self.list_anchors(status=AnchorStatus.PENDING.value)
+        return await self.list_anchors(status=AnchorStatus.PENDING)
 
     async def get_failed_anchors(self) -> list[AnchorRecord]:
         """
@@ -433,7 +659,7 @@ class AnchorRepository:
         Returns:
             List of failed AnchorRecords
         """
-        return await self.list_anchors(status=AnchorStatus.FAILED.value)
+        return await self.list_anchors(status=AnchorStatus.FAILED)
 
     async def count_anchors(self, status: str | None = None) -> int:
         """
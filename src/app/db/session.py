@@ -21,6 +21,11 @@ engine = create_async_engine(
     pool_pre_ping=True,
     pool_recycle=3600,
     echo=settings.DEBUG,
+    # Fixed-SQL queries are re-prepared per connection unless cached
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
 )
 
 async_session_factory = async_sessionmaker(
@@ -5,20 +5,23 @@ Orchestrates anchor creation, posting, and persistence.
 Provides methods for the API and scheduler to trigger anchoring.
 """
 
-import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import StrEnum
 from typing import Any
-from uuid import UUID, uuid4
+from uuid import UUID
 
 import structlog
 
+from app.core.ids import uuid7
+from app.core.logging import DigestPreview
+from app.services.event_consumer import invalidate_anchor_cache
 from app.services.iota_client import (
     AnchorMessage,
     IOTAClient,
     IOTAClientError,
     PostingError,
+    build_explorer_url,
 )
 
 logger = structlog.get_logger(__name__)
@@ -36,7 +39,7 @@ class AnchorStatus(StrEnum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class AnchorRecord:
     """Anchor record for persistence."""
 
@@ -50,14 +53,19 @@ class AnchorRecord:
     iota_block_id: str | None = None
     iota_network: str | None = None
     explorer_url: str | None = None
-    created_at: datetime = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
     posted_at: datetime | None = None
     confirmed_at: datetime | None = None
     error_message: str | None = None
 
-    def __post_init__(self) -> None:
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
+    @property
+    def block_explorer_url(self) -> str | None:
+        """Get the explorer URL, derived from the block ID unless stored."""
+        if self.explorer_url:
+            return self.explorer_url
+        if self.iota_block_id:
+            return build_explorer_url(self.iota_block_id)
+        return None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for API responses."""
@@ -68,10 +76,10 @@ class AnchorRecord:
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat(),
             "item_count": self.item_count,
-            "status": self.status.value,
+            "status": self.status,
             "iota_block_id": self.iota_block_id,
             "iota_network": self.iota_network,
-            "explorer_url": self.explorer_url,
+            "explorer_url": self.block_explorer_url,
             "created_at": self.created_at.isoformat(),
             "posted_at": self.posted_at.isoformat() if self.posted_at else None,
             "confirmed_at": self.confirmed_at.isoformat() if self.confirmed_at else None,
@@ -79,6 +87,28 @@ class AnchorRecord:
         }
 
 
+# Digest method -> (digest algorithm, anchor type)
+_METHOD_SPECS: dict[str, tuple[str, str]] = {
+    "merkle_sha256": ("sha256", "merkle_root"),
+    "merkle_blake3": ("blake3", "merkle_root"),
+    "sha256": ("sha256", "hash"),
+    "blake3": ("blake3", "hash"),
+}
+
+
+def digest_algorithm_for(method: str) -> str:
+    """
+    Get the hash algorithm name for a digest method.
+
+    Args:
+        method: Digest method (merkle_sha256, merkle_blake3, sha256, etc.)
+
+    Returns:
+        Hash algorithm name
+    """
+    return _METHOD_SPECS.get(method, (method, "hash"))[0]
+
+
 class AnchorServiceError(Exception):
     """Base exception for anchor service errors."""
 
@@ -99,8 +129,9 @@ class AnchorService:
     def __init__(self) -> None:
         """Initialize anchor service."""
         self._iota_client = IOTAClient()
+        # Only touched from the event loop, and never across an await,
+        # so plain dict operations are safe without a lock.
         self._pending_anchors: dict[UUID, AnchorRecord] = {}
-        self._lock = asyncio.Lock()
 
     @property
     def iota_client(self) -> IOTAClient:
@@ -136,7 +167,7 @@ class AnchorService:
             item_count: Number of items in the anchor
             start_time: Start of the anchored time window
             end_time: End of the anchored time window
-            method: Digest method (merkle_sha256, sha256, etc.)
+            method: Digest method (merkle_sha256, merkle_blake3, sha256, etc.)
             metadata: Optional metadata to include
             wait_for_confirmation: Whether to wait for Tangle confirmation
 
@@ -146,12 +177,12 @@ class AnchorService:
         Raises:
             AnchorServiceError: If anchoring fails
         """
-        anchor_id = uuid4()
+        anchor_id = uuid7()
 
         logger.info(
             "Creating anchor",
             anchor_id=str(anchor_id),
-            digest=digest[:16] + "...",
+            digest=DigestPreview(digest),
             item_count=item_count,
             start_time=start_time.isoformat(),
             end_time=end_time.isoformat(),
@@ -168,18 +199,18 @@ class AnchorService:
             status=AnchorStatus.PENDING,
         )
 
-        async with self._lock:
-            self._pending_anchors[anchor_id] = record
+        self._pending_anchors[anchor_id] = record
 
         try:
             # Update status to building
             record.status = AnchorStatus.BUILDING
 
             # Create anchor message
+            digest_algorithm, anchor_type = _METHOD_SPECS.get(method, (method, "hash"))
             message = AnchorMessage(
                 digest=digest,
-                digest_algorithm="sha256" if "sha256" in method else method,
-                anchor_type="merkle_root" if "merkle" in method else "hash",
+                digest_algorithm=digest_algorithm,
+                anchor_type=anchor_type,
                 event_count=item_count,
                 start_time=int(start_time.timestamp()),
                 end_time=int(end_time.timestamp()),
@@ -198,9 +229,6 @@ class AnchorService:
             # Update record with Tangle references
             record.iota_block_id = block_metadata.block_id
             record.iota_network = block_metadata.network
-            record.explorer_url = self._iota_client.get_explorer_url(
-                block_metadata.block_id
-            )
             record.posted_at = datetime.utcnow()
 
             if block_metadata.referenced_by_milestone:
@@ -209,11 +237,13 @@ class AnchorService:
             else:
                 record.status = AnchorStatus.POSTED
 
+            invalidate_anchor_cache()
+
             logger.info(
                 "Anchor created successfully",
                 anchor_id=str(anchor_id),
                 block_id=block_metadata.block_id,
-                status=record.status.value,
+                status=record.status,
             )
 
             return record
@@ -239,8 +269,7 @@ class AnchorService:
             raise AnchorServiceError(f"IOTA error: {e}") from e
 
         finally:
-            async with self._lock:
-                self._pending_anchors.pop(anchor_id, None)
+            self._pending_anchors.pop(anchor_id, None)
 
     async def check_confirmation(self, anchor_id: UUID, block_id: str) -> AnchorRecord:
         """
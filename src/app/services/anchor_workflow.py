@@ -8,6 +8,8 @@ Orchestrates the complete anchoring workflow:
 4. Store anchor record and items
 """
 
+import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
@@ -18,9 +20,14 @@ from prometheus_client import Counter, Histogram
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.logging import DigestPreview
 from app.crypto.merkle import MerkleTree
 from app.db.repository import AnchorRepository
-from app.services.anchor_service import AnchorRecord, AnchorService
+from app.services.anchor_service import (
+    AnchorRecord,
+    AnchorService,
+    digest_algorithm_for,
+)
 from app.services.event_consumer import EventConsumer, IndexedEvent
 
 ANCHOR_JOB_LOCK_ID = 839_421_765
@@ -43,8 +50,15 @@ ANCHOR_WORKFLOW_DURATION = Histogram(
     buckets=[1, 5, 10, 30, 60, 120, 300, 600],
 )
 
+# Pre-bound label children for the job outcome counter
+_JOBS_SKIPPED = ANCHOR_JOBS_TOTAL.labels(status="skipped")
+_JOBS_EMPTY = ANCHOR_JOBS_TOTAL.labels(status="empty")
+_JOBS_DUPLICATE = ANCHOR_JOBS_TOTAL.labels(status="duplicate")
+_JOBS_SUCCESS = ANCHOR_JOBS_TOTAL.labels(status="success")
+_JOBS_ERROR = ANCHOR_JOBS_TOTAL.labels(status="error")
+
 
-@dataclass
+@dataclass(slots=True)
 class AnchorResult:
     """Result of an anchoring workflow."""
 
@@ -116,6 +130,7 @@ class AnchorWorkflow:
         start_time: datetime | None = None,
         end_time: datetime | None = None,
         wait_for_confirmation: bool = True,
+        method: str = "merkle_sha256",
     ) -> AnchorResult:
         """
         Run a complete anchoring job.
@@ -124,11 +139,12 @@ class AnchorWorkflow:
             start_time: Start of anchor window (defaults to last anchor end)
             end_time: End of anchor window (defaults to now)
             wait_for_confirmation: Whether to wait for IOTA confirmation
+            method: Digest method (merkle_sha256 or merkle_blake3)
 
         Returns:
             AnchorResult with status and details
         """
-        job_start = datetime.utcnow()
+        job_start = time.perf_counter()
 
         # Acquire advisory lock to prevent concurrent anchor runs
         lock_result = await self._session.execute(
@@ -138,7 +154,7 @@ class AnchorWorkflow:
         acquired = lock_result.scalar()
         if not acquired:
             logger.warning("Another anchor job is already running, skipping")
-            ANCHOR_JOBS_TOTAL.labels(status="skipped").inc()
+            _JOBS_SKIPPED.inc()
             return AnchorResult(
                 success=True,
                 anchor_id=None,
@@ -146,8 +162,8 @@ class AnchorWorkflow:
                 event_count=0,
                 iota_block_id=None,
                 error="Skipped: concurrent job in progress",
-                start_time=start_time or job_start,
-                end_time=end_time or job_start,
+                start_time=start_time or datetime.utcnow(),
+                end_time=end_time or datetime.utcnow(),
                 duration_seconds=0.0,
             )
 
@@ -156,7 +172,11 @@ class AnchorWorkflow:
             end_time = datetime.utcnow()
 
         if start_time is None:
-            last_anchor_time = await self._event_consumer.get_last_anchor_time()
+            # Read under the lock and uncached: another process may have
+            # anchored since this one last looked
+            last_anchor_time = await self._event_consumer.get_last_anchor_time(
+                use_cache=False
+            )
             if last_anchor_time:
                 start_time = last_anchor_time
             else:
@@ -174,11 +194,12 @@ class AnchorWorkflow:
             window = await self._event_consumer.fetch_events_for_window(
                 start_time=start_time,
                 end_time=end_time,
+                include_data=False,
             )
 
             if window.is_empty:
                 logger.info("No events to anchor")
-                ANCHOR_JOBS_TOTAL.labels(status="empty").inc()
+                _JOBS_EMPTY.inc()
                 return AnchorResult(
                     success=True,
                     anchor_id=None,
@@ -188,17 +209,20 @@ class AnchorWorkflow:
                     error=None,
                     start_time=start_time,
                     end_time=end_time,
-                    duration_seconds=(datetime.utcnow() - job_start).total_seconds(),
+                    duration_seconds=time.perf_counter() - job_start,
                 )
 
             # Step 2: Build Merkle tree
-            tree = MerkleTree.from_raw_hashes(window.event_hashes)
+            tree = MerkleTree.from_raw_hashes(
+                window.event_hashes,
+                algorithm=digest_algorithm_for(method),
+            )
             digest = tree.root_hash
 
             logger.info(
                 "Built Merkle tree",
                 event_count=window.event_count,
-                digest=digest[:16] + "...",
+                digest=DigestPreview(digest),
             )
 
             # Step 3: Check for duplicate anchor (idempotency)
@@ -212,7 +236,7 @@ class AnchorWorkflow:
                     "Anchor already exists",
                     anchor_id=str(existing.id),
                 )
-                ANCHOR_JOBS_TOTAL.labels(status="duplicate").inc()
+                _JOBS_DUPLICATE.inc()
                 return AnchorResult(
                     success=True,
                     anchor_id=existing.id,
@@ -222,40 +246,50 @@ class AnchorWorkflow:
                     error=None,
                     start_time=start_time,
                     end_time=end_time,
-                    duration_seconds=(datetime.utcnow() - job_start).total_seconds(),
+                    duration_seconds=time.perf_counter() - job_start,
                 )
 
-            # Step 4: Create and post anchor to IOTA Tangle
-            anchor_record = await self._anchor_service.create_anchor(
-                digest=digest,
-                item_count=window.event_count,
-                start_time=start_time,
-                end_time=end_time,
-                method="merkle_sha256",
-                wait_for_confirmation=wait_for_confirmation,
+            # Step 4: Create and post anchor to IOTA Tangle, generating
+            # proofs in a worker thread while the post is in flight
+            proofs_task = asyncio.create_task(
+                asyncio.to_thread(tree.get_all_compact_proofs)
             )
+            try:
+                anchor_record = await self._anchor_service.create_anchor(
+                    digest=digest,
+                    item_count=window.event_count,
+                    start_time=start_time,
+                    end_time=end_time,
+                    method=method,
+                    wait_for_confirmation=wait_for_confirmation,
+                )
+            except BaseException:
+                proofs_task.cancel()
+                raise
+            proofs = await proofs_task
 
             # Step 5: Atomically persist anchor record and items
             await self._repository.save_anchor(anchor_record)
             await self._store_anchor_items(
                 anchor_id=anchor_record.id,
-                tree=tree,
                 events=window.events,
+                proofs=proofs,
                 commit=False,
             )
             await self._session.commit()
+            self._event_consumer.record_anchor(end_time)
 
             # Update metrics
-            ANCHOR_JOBS_TOTAL.labels(status="success").inc()
+            _JOBS_SUCCESS.inc()
             ANCHOR_EVENTS_TOTAL.inc(window.event_count)
 
-            duration = (datetime.utcnow() - job_start).total_seconds()
+            duration = time.perf_counter() - job_start
             ANCHOR_WORKFLOW_DURATION.observe(duration)
 
             logger.info(
                 "Anchor job completed",
                 anchor_id=str(anchor_record.id),
-                digest=digest[:16] + "...",
+                digest=DigestPreview(digest),
                 event_count=window.event_count,
                 iota_block_id=anchor_record.iota_block_id,
                 duration_seconds=round(duration, 2),
@@ -274,8 +308,8 @@ class AnchorWorkflow:
             )
 
         except Exception as e:
-            ANCHOR_JOBS_TOTAL.labels(status="error").inc()
-            duration = (datetime.utcnow() - job_start).total_seconds()
+            _JOBS_ERROR.inc()
+            duration = time.perf_counter() - job_start
 
             logger.error(
                 "Anchor job failed",
@@ -333,11 +367,13 @@ class AnchorWorkflow:
         Returns:
             AnchorResult if anchor was created, None otherwise
         """
-        last_time = await self._event_consumer.get_last_anchor_time()
+        default_since = datetime.utcnow() - timedelta(days=1)
+        last_time, event_count = await self._event_consumer.get_anchor_context(
+            default_since,
+            count_limit=min_events,
+        )
         if not last_time:
-            last_time = datetime.utcnow() - timedelta(days=1)
-
-        event_count = await self._event_consumer.get_event_count_since(last_time)
+            last_time = default_since
 
         if event_count < min_events:
             logger.debug(
@@ -371,8 +407,8 @@ class AnchorWorkflow:
     async def _store_anchor_items(
         self,
         anchor_id: UUID,
-        tree: MerkleTree,
         events: list[IndexedEvent],
+        proofs: list[list[str]],
         commit: bool = True,
     ) -> None:
         """
@@ -380,8 +416,8 @@ class AnchorWorkflow:
 
         Args:
             anchor_id: Parent anchor ID
-            tree: Merkle tree used for anchoring
             events: List of events in tree order
+            proofs: Compact Merkle proofs in tree order
             commit: Whether to commit the transaction (False when caller manages tx)
         """
         logger.info(
@@ -390,16 +426,13 @@ class AnchorWorkflow:
             count=len(events),
         )
 
-        for i, event in enumerate(events):
-            proof = tree.get_proof(i)
-
-            await self._repository.save_anchor_item(
-                anchor_id=anchor_id,
-                event_hash=event.event_hash,
-                position=i,
-                event_id=event.id,
-                merkle_proof=proof.to_compact(),
-            )
+        await self._repository.save_anchor_items(
+            anchor_id=anchor_id,
+            items=[
+                (event.id, event.event_hash, proof)
+                for event, proof in zip(events, proofs, strict=True)
+            ],
+        )
 
         if commit:
             await self._session.commit()
@@ -5,19 +5,161 @@ Consumes indexed events from the Substrate indexer database
 and collects event hashes for anchoring.
 """
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+import orjson
 import structlog
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+
 logger = structlog.get_logger(__name__)
 
+# Rows fetched per round trip when streaming event windows
+EVENT_STREAM_BATCH_SIZE = 2000
+
+# Anchoring needs only event identity and ordering; the JSONB payload is
+# replaced with an empty object to keep it off the wire
+_EVENT_DATA_SQL = "COALESCE(event_data, '{}'::jsonb)"
+_EVENT_DATA_OMITTED_SQL = "'{}'::jsonb"
+
+
+def _event_window_query(event_data_sql: str, by_pallet: bool) -> TextClause:
+    """Build a streamed event window statement."""
+    pallet_filter = "AND pallet = ANY(:pallets)" if by_pallet else ""
+    return text(f"""
+        SELECT id, block_number, block_hash, event_index,
+               pallet, event_name,
+               {event_data_sql} AS event_data,
+               event_hash, created_at AS timestamp
+        FROM indexed_events
+        WHERE created_at >= :start_time
+          AND created_at < :end_time
+          {pallet_filter}
+        ORDER BY block_number, event_index
+    """).execution_options(yield_per=EVENT_STREAM_BATCH_SIZE)
+
+
+_UNANCHORED_SQL = """
+    SELECT ie.id, ie.block_number, ie.block_hash, ie.event_index,
+           ie.pallet, ie.event_name,
+           COALESCE(ie.event_data, '{}'::jsonb) AS event_data,
+           ie.event_hash, ie.created_at AS timestamp
+    FROM indexed_events ie
+    WHERE NOT EXISTS (
+        SELECT 1 FROM anchor_items ai
+        WHERE ai.event_hash = ie.event_hash
+    )
+"""
 
-@dataclass
+# Statements are built once so each call reuses SQLAlchemy's compiled
+# form and the driver's prepared statement
+_Q_EVENTS = _event_window_query(_EVENT_DATA_SQL, by_pallet=False)
+_Q_EVENTS_PALLETS = _event_window_query(_EVENT_DATA_SQL, by_pallet=True)
+_Q_EVENT_KEYS = _event_window_query(_EVENT_DATA_OMITTED_SQL, by_pallet=False)
+_Q_EVENT_KEYS_PALLETS = _event_window_query(_EVENT_DATA_OMITTED_SQL, by_pallet=True)
+
+_Q_UNANCHORED = text(
+    _UNANCHORED_SQL + "ORDER BY ie.block_number, ie.event_index LIMIT :limit"
+)
+_Q_UNANCHORED_SINCE = text(
+    _UNANCHORED_SQL
+    + "AND ie.created_at >= :since "
+    + "ORDER BY ie.block_number, ie.event_index LIMIT :limit"
+)
+
+_Q_LAST_ANCHOR_TIME = text("""
+    SELECT end_time
+    FROM anchors
+    WHERE status IN ('posted', 'confirmed')
+    ORDER BY end_time DESC
+    LIMIT 1
+""")
+
+_Q_EVENT_COUNT_SINCE = text("""
+    SELECT COUNT(*) as count
+    FROM indexed_events
+    WHERE created_at >= :since
+""")
+
+# LIMIT stops the scan once the threshold is met
+_Q_HAS_EVENTS_SINCE = text("""
+    SELECT COUNT(*) AS count
+    FROM (
+        SELECT 1
+        FROM indexed_events
+        WHERE created_at >= :since
+        LIMIT :threshold
+    ) AS capped
+""")
+
+# A NULL :count_limit means LIMIT ALL, i.e. an exact count
+_Q_ANCHOR_CONTEXT = text("""
+    WITH last_anchor AS (
+        SELECT end_time
+        FROM anchors
+        WHERE status IN ('posted', 'confirmed')
+        ORDER BY end_time DESC
+        LIMIT 1
+    )
+    SELECT la.end_time AS last_anchor_time,
+           (
+               SELECT COUNT(*)
+               FROM (
+                   SELECT 1
+                   FROM indexed_events
+                   WHERE created_at >= COALESCE(la.end_time, :default_since)
+                   LIMIT :count_limit
+               ) AS capped
+           ) AS event_count
+    FROM (SELECT 1) AS one
+    LEFT JOIN last_anchor la ON TRUE
+""")
+
+# Scheduler ticks repeat the same "is there anything to anchor?" queries;
+# cache their results briefly, shared across consumer instances.
+_query_cache: dict[Any, tuple[float, Any]] = {}
+
+
+def _cache_get(key: Any) -> Any | None:
+    """Get a cached query result, or None if missing or expired."""
+    entry = _query_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at <= time.monotonic():
+        del _query_cache[key]
+        return None
+    return value
+
+
+def _cache_set(key: Any, value: Any) -> None:
+    """Cache a query result for the TTL."""
+    _query_cache[key] = (time.monotonic() + settings.EVENT_QUERY_CACHE_TTL, value)
+
+
+def _cached_event_count(since: datetime, count_limit: int | None) -> int | None:
+    """Get a cached event count, capped at count_limit if given."""
+    bucket = since.replace(microsecond=0)
+    exact = _cache_get(("event_count", bucket))
+    if exact is not None:
+        return exact if count_limit is None else min(exact, count_limit)
+    if count_limit is None:
+        return None
+    return _cache_get(("event_count", bucket, count_limit))
+
+
+def invalidate_anchor_cache() -> None:
+    """Drop cached anchor lookups after a new anchor has been posted."""
+    _query_cache.clear()
+
+
+@dataclass(slots=True)
 class IndexedEvent:
     """Represents an indexed blockchain event."""
 
@@ -45,8 +187,24 @@ class IndexedEvent:
             "timestamp": self.timestamp.isoformat(),
         }
 
+    @staticmethod
+    def to_json_batch(events: list["IndexedEvent"]) -> bytes:
+        """
+        Serialize a batch of events to a JSON array in one call.
+
+        orjson encodes the slotted dataclasses natively, producing the same
+        fields as to_dict without building an intermediate dict per event.
+
+        Args:
+            events: Events to serialize
+
+        Returns:
+            UTF-8 JSON array bytes
+        """
+        return orjson.dumps(events)
 
-@dataclass
+
+@dataclass(slots=True)
 class EventWindow:
     """Represents a time window of events for anchoring."""
 
@@ -102,6 +260,7 @@ class EventConsumer:
         start_time: datetime,
         end_time: datetime,
         pallets: list[str] | None = None,
+        include_data: bool = True,
     ) -> EventWindow:
         """
         Fetch indexed events for a time window.
@@ -110,6 +269,8 @@ class EventConsumer:
             start_time: Start of time window
             end_time: End of time window
             pallets: Optional filter by pallet names
+            include_data: Whether to load event payloads; when False each
+                event's event_data is an empty dict
 
         Returns:
             EventWindow containing events
@@ -122,50 +283,22 @@ class EventConsumer:
         )
 
         try:
-            # Build query
+            params: dict[str, Any] = {
+                "start_time": start_time,
+                "end_time": end_time,
+            }
             if pallets:
-                pallet_filter = "AND pallet = ANY(:pallets)"
-                params = {
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "pallets": pallets,
-                }
+                params["pallets"] = pallets
+                query = _Q_EVENTS_PALLETS if include_data else _Q_EVENT_KEYS_PALLETS
             else:
-                pallet_filter = ""
-                params = {
-                    "start_time": start_time,
-                    "end_time": end_time,
-                }
-
-            query = text(f"""
-                SELECT id, block_number, block_hash, event_index,
-                       pallet, event_name, event_data, event_hash,
-                       created_at as timestamp
-                FROM indexed_events
-                WHERE created_at >= :start_time
-                  AND created_at < :end_time
-                  {pallet_filter}
-                ORDER BY block_number, event_index
-            """)
-
-            result = await self._session.execute(query, params)
-            rows = result.fetchall()
-
-            events = []
-            for row in rows:
-                events.append(
-                    IndexedEvent(
-                        id=row.id,
-                        block_number=row.block_number,
-                        block_hash=row.block_hash,
-                        event_index=row.event_index,
-                        pallet=row.pallet,
-                        event_name=row.event_name,
-                        event_data=row.event_data or {},
-                        event_hash=row.event_hash,
-                        timestamp=row.timestamp,
-                    )
-                )
+                query = _Q_EVENTS if include_data else _Q_EVENT_KEYS
+
+            # Stream through a server-side cursor so large windows are not
+            # buffered by the driver in full before conversion
+            result = await self._session.stream(query, params)
+            events: list[IndexedEvent] = []
+            async for partition in result.mappings().partitions():
+                events.extend(IndexedEvent(**row) for row in partition)
 
             # Update last consumed position
             if events:
@@ -208,51 +341,14 @@ class EventConsumer:
 
         try:
             if since:
-                query = text("""
-                    SELECT ie.id, ie.block_number, ie.block_hash, ie.event_index,
-                           ie.pallet, ie.event_name, ie.event_data, ie.event_hash,
-                           ie.created_at as timestamp
-                    FROM indexed_events ie
-                    LEFT JOIN anchor_items ai ON ie.event_hash = ai.event_hash
-                    WHERE ai.id IS NULL
-                      AND ie.created_at >= :since
-                    ORDER BY ie.block_number, ie.event_index
-                    LIMIT :limit
-                """)
                 result = await self._session.execute(
-                    query,
+                    _Q_UNANCHORED_SINCE,
                     {"since": since, "limit": limit},
                 )
             else:
-                query = text("""
-                    SELECT ie.id, ie.block_number, ie.block_hash, ie.event_index,
-                           ie.pallet, ie.event_name, ie.event_data, ie.event_hash,
-                           ie.created_at as timestamp
-                    FROM indexed_events ie
-                    LEFT JOIN anchor_items ai ON ie.event_hash = ai.event_hash
-                    WHERE ai.id IS NULL
-                    ORDER BY ie.block_number, ie.event_index
-                    LIMIT :limit
-                """)
-                result = await self._session.execute(query, {"limit": limit})
-
-            rows = result.fetchall()
-
-            events = []
-            for row in rows:
-                events.append(
-                    IndexedEvent(
-                        id=row.id,
-                        block_number=row.block_number,
-                        block_hash=row.block_hash,
-                        event_index=row.event_index,
-                        pallet=row.pallet,
-                        event_name=row.event_name,
-                        event_data=row.event_data or {},
-                        event_hash=row.event_hash,
-                        timestamp=row.timestamp,
-                    )
-                )
+                result = await self._session.execute(_Q_UNANCHORED, {"limit": limit})
+
+            events = [IndexedEvent(**row) for row in result.mappings()]
 
             logger.info("Fetched unanchored events", count=len(events))
             return events
@@ -261,25 +357,30 @@ class EventConsumer:
             logger.error("Failed to fetch unanchored events", error=str(e))
             raise EventConsumerError(f"Failed to fetch unanchored events: {e}") from e
 
-    async def get_last_anchor_time(self) -> datetime | None:
+    async def get_last_anchor_time(self, use_cache: bool = True) -> datetime | None:
         """
         Get the end time of the last successful anchor.
 
+        Args:
+            use_cache: Whether a cached value may be returned; pass False when
+                the result decides which events get anchored
+
         Returns:
             End time of last anchor, or None if no anchors exist
         """
+        if use_cache:
+            cached = _cache_get("last_anchor_time")
+            if cached is not None:
+                return cached
+
         try:
-            query = text("""
-                SELECT end_time
-                FROM anchors
-                WHERE status IN ('posted', 'confirmed')
-                ORDER BY end_time DESC
-                LIMIT 1
-            """)
-            result = await self._session.execute(query)
+            result = await self._session.execute(_Q_LAST_ANCHOR_TIME)
             row = result.fetchone()
 
-            return row.end_time if row else None
+            if row is None:
+                return None
+            _cache_set("last_anchor_time", row.end_time)
+            return row.end_time
 
         except Exception as e:
             logger.error("Failed to get last anchor time", error=str(e))
@@ -295,20 +396,121 @@ class EventConsumer:
         Returns:
             Number of events
         """
+        # Bucket to whole seconds so near-identical callers share a result
+        cache_key = ("event_count", since.replace(microsecond=0))
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            query = text("""
-                SELECT COUNT(*) as count
-                FROM indexed_events
-                WHERE created_at >= :since
-            """)
-            result = await self._session.execute(query, {"since": since})
+            result = await self._session.execute(
+                _Q_EVENT_COUNT_SINCE,
+                {"since": since},
+            )
             row = result.fetchone()
-            return row.count if row else 0
+            count = row.count if row else 0
+            _cache_set(cache_key, count)
+            return count
 
         except Exception as e:
             logger.error("Failed to get event count", error=str(e))
             return 0
 
+    async def has_at_least_events_since(self, since: datetime, threshold: int) -> bool:
+        """
+        Check whether at least a number of events exist since a given time.
+
+        Stops counting at the threshold instead of counting every row.
+
+        Args:
+            since: Start time
+            threshold: Number of events required
+
+        Returns:
+            True if at least threshold events exist
+        """
+        exact = _cache_get(("event_count", since.replace(microsecond=0)))
+        if exact is not None:
+            return exact >= threshold
+
+        try:
+            result = await self._session.execute(
+                _Q_HAS_EVENTS_SINCE,
+                {"since": since, "threshold": threshold},
+            )
+            return (result.scalar() or 0) >= threshold
+
+        except Exception as e:
+            logger.error("Failed to check event count", error=str(e))
+            return False
+
+    async def get_anchor_context(
+        self,
+        default_since: datetime,
+        count_limit: int | None = None,
+    ) -> tuple[datetime | None, int]:
+        """
+        Get the last anchor time and the event count since it in one query.
+
+        Fuses get_last_anchor_time and get_event_count_since into a single
+        round trip for the scheduler tick.
+
+        Args:
+            default_since: Count start used when no anchor exists yet
+            count_limit: Stop counting at this many events (None counts all)
+
+        Returns:
+            Tuple of (last anchor end time or None, event count, capped at
+            count_limit)
+        """
+        last_anchor_time = _cache_get("last_anchor_time")
+        if last_anchor_time is not None:
+            cached_count = _cached_event_count(last_anchor_time, count_limit)
+            if cached_count is not None:
+                return last_anchor_time, cached_count
+
+        try:
+            result = await self._session.execute(
+                _Q_ANCHOR_CONTEXT,
+                {"default_since": default_since, "count_limit": count_limit},
+            )
+            row = result.fetchone()
+
+        except Exception as e:
+            logger.error("Failed to get anchor context", error=str(e))
+            return None, 0
+
+        if row is None:
+            return None, 0
+
+        last_anchor_time = row.last_anchor_time
+        since = last_anchor_time or default_since
+        if last_anchor_time is not None:
+            _cache_set("last_anchor_time", last_anchor_time)
+        bucket = since.replace(microsecond=0)
+        if count_limit is None or row.event_count < count_limit:
+            _cache_set(("event_count", bucket), row.event_count)
+        else:
+            _cache_set(("event_count", bucket, count_limit), row.event_count)
+        return last_anchor_time, row.event_count
+
+    def record_anchor(self, end_time: datetime) -> None:
+        """
+        Update cached query results after a successful anchor.
+
+        Drops cached event counts. The new end time is written through only
+        when it advances the cached last anchor time; the database returns
+        MAX(end_time), so an anchor for an older window (or an empty cache)
+        leaves the value to be re-read on the next tick.
+
+        Args:
+            end_time: End time of the anchor just created
+        """
+        cached = _cache_get("last_anchor_time")
+        invalidate_anchor_cache()
+        if cached is not None and end_time > cached:
+            _cache_set("last_anchor_time", end_time)
+
     @property
     def last_block(self) -> int | None:
         """Get last consumed block number."""
@@ -8,12 +8,16 @@ Provides connection management, message posting, and confirmation monitoring.
 import asyncio
 import hashlib
 import json
+import random
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import StrEnum
 from typing import Any
 
 import httpx
+import orjson
 import structlog
 from tenacity import (
     AsyncRetrying,
@@ -24,9 +28,18 @@ from tenacity import (
 )
 
 from app.core.config import settings
+from app.core.logging import DigestPreview
 
 logger = structlog.get_logger(__name__)
 
+# Confirmation polling backoff: first delay, growth factor and jitter ratio
+CONFIRMATION_POLL_BASE_DELAY = 0.25
+CONFIRMATION_POLL_BACKOFF = 1.5
+CONFIRMATION_POLL_JITTER = 0.2
+
+# Block metadata responses kept for conditional GETs
+METADATA_CACHE_SIZE = 1000
+
 
 class MessageStatus(StrEnum):
     """IOTA message confirmation status."""
@@ -37,20 +50,20 @@ class MessageStatus(StrEnum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockMetadata:
     """Metadata for a posted IOTA block."""
 
     block_id: str
     network: str
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
     is_solid: bool = False
     referenced_by_milestone: bool = False
     milestone_index: int | None = None
     ledger_inclusion_state: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AnchorMessage:
     """Anchor message structure for IOTA Tangle."""
 
@@ -63,13 +76,22 @@ class AnchorMessage:
     end_time: int = 0
     version: str = "1.0"
     metadata: dict[str, Any] = field(default_factory=dict)
+    _encoded: bytes | None = field(default=None, init=False, repr=False, compare=False)
+    _data_hex: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.timestamp == 0:
-            self.timestamp = int(datetime.utcnow().timestamp())
+            self.timestamp = int(time.time())
 
     def to_bytes(self) -> bytes:
-        """Serialize message to bytes for Tangle posting."""
+        """
+        Serialize message to bytes for Tangle posting.
+
+        The encoding is computed once and reused; messages are treated
+        as immutable after construction.
+        """
+        if self._encoded is not None:
+            return self._encoded
         data = {
             "digest": self.digest,
             "algorithm": self.digest_algorithm,
@@ -81,14 +103,61 @@ class AnchorMessage:
             "v": self.version,
         }
         if self.metadata:
+            # Free-form metadata keeps the original stdlib encoding: orjson
+            # writes non-ASCII as raw UTF-8 (json escapes it) and formats
+            # some floats differently, which would change posted bytes and
+            # compute_hash() for existing verifiers
             data["meta"] = self.metadata
-        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+            self._encoded = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        else:
+            # Fixed ASCII str/int fields: orjson output is byte-identical
+            self._encoded = orjson.dumps(data)
+        return self._encoded
+
+    @property
+    def data_hex(self) -> str:
+        """Hex-encoded message bytes for the tagged data payload."""
+        if self._data_hex is None:
+            self._data_hex = self.to_bytes().hex()
+        return self._data_hex
 
     def compute_hash(self) -> str:
         """Compute hash of the anchor message."""
         return hashlib.sha256(self.to_bytes()).hexdigest()
 
 
+def build_explorer_url(block_id: str) -> str:
+    """
+    Build the explorer URL for a block.
+
+    Args:
+        block_id: Block ID
+
+    Returns:
+        URL to view block in explorer
+    """
+    return f"{settings.IOTA_EXPLORER_URL}/block/{block_id}"
+
+
+def _confirmation_poll_delay(attempt: int) -> float:
+    """
+    Get the jittered exponential backoff delay for a confirmation poll.
+
+    Args:
+        attempt: Zero-based poll attempt
+
+    Returns:
+        Delay in seconds, capped at IOTA_CONFIRMATION_POLL_INTERVAL
+    """
+    delay = min(
+        settings.IOTA_CONFIRMATION_POLL_INTERVAL,
+        CONFIRMATION_POLL_BASE_DELAY * CONFIRMATION_POLL_BACKOFF**attempt,
+    )
+    return delay * random.uniform(
+        1 - CONFIRMATION_POLL_JITTER, 1 + CONFIRMATION_POLL_JITTER
+    )
+
+
 class IOTAClientError(Exception):
     """Base exception for IOTA client errors."""
 
@@ -141,9 +210,24 @@ class IOTAClient:
         self._node_url = node_url.rstrip("/")
         self._network = network
         self._tag = tag
+        self._tag_hex = tag.encode("utf-8").hex()
+        # Retry policy objects are stateless, so one set serves every submit
+        self._retry_config: dict[str, Any] = {
+            "stop": stop_after_attempt(settings.IOTA_RETRY_COUNT),
+            "wait": wait_exponential(
+                multiplier=settings.IOTA_RETRY_DELAY,
+                max=settings.IOTA_RETRY_MAX_DELAY,
+            ),
+            "retry": retry_if_exception_type((httpx.HTTPError, IOTAClientError)),
+            "reraise": True,
+        }
         self._client: httpx.AsyncClient | None = None
         self._connected = False
         self._node_info: dict[str, Any] | None = None
+        # block_id -> (request validator headers, last metadata), LRU ordered
+        self._metadata_cache: OrderedDict[
+            str, tuple[dict[str, str], BlockMetadata]
+        ] = OrderedDict()
 
     @property
     def is_connected(self) -> bool:
@@ -164,7 +248,8 @@ class IOTAClient:
         """
         Establish connection to IOTA node.
 
-        Verifies node health and retrieves node info.
+        Verifies node health and retrieves node info. The health check
+        also warms the pooled HTTP/2 connection for subsequent requests.
         """
         logger.info(
             "Connecting to IOTA node",
@@ -174,6 +259,12 @@ class IOTAClient:
 
         self._client = httpx.AsyncClient(
             base_url=self._node_url,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.IOTA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.IOTA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.IOTA_KEEPALIVE_EXPIRY,
+            ),
             timeout=httpx.Timeout(settings.IOTA_REQUEST_TIMEOUT),
             headers={"Content-Type": "application/json"},
         )
@@ -231,7 +322,7 @@ class IOTAClient:
 
         logger.info(
             "Posting anchor to Tangle",
-            digest=message.digest[:16] + "...",
+            digest=DigestPreview(message.digest),
             event_count=message.event_count,
             tag=self._tag,
         )
@@ -273,16 +364,28 @@ class IOTAClient:
 
         Returns:
             BlockMetadata with current status
+
+        Repeat polls send the previous ETag / Last-Modified validators so
+        the node can answer 304 Not Modified without a body.
         """
         if not self.is_connected:
             await self.connect()
 
+        cached = self._metadata_cache.get(block_id)
+
         try:
-            response = await self._client.get(f"/api/core/v2/blocks/{block_id}/metadata")
+            response = await self._client.get(
+                f"/api/core/v2/blocks/{block_id}/metadata",
+                headers=cached[0] if cached else None,
+            )
+            if cached and response.status_code == 304:
+                self._metadata_cache.move_to_end(block_id)
+                return cached[1]
+
             response.raise_for_status()
             data = response.json()
 
-            return BlockMetadata(
+            metadata = BlockMetadata(
                 block_id=block_id,
                 network=self._network,
                 is_solid=data.get("isSolid", False),
@@ -290,11 +393,35 @@ class IOTAClient:
                 milestone_index=data.get("referencedByMilestoneIndex"),
                 ledger_inclusion_state=data.get("ledgerInclusionState"),
             )
+            self._remember_metadata(block_id, response.headers, metadata)
+            return metadata
 
         except httpx.HTTPError as e:
             logger.error("Failed to get block metadata", block_id=block_id, error=str(e))
             raise IOTAClientError(f"Failed to get block metadata: {e}") from e
 
+    def _remember_metadata(
+        self,
+        block_id: str,
+        headers: httpx.Headers,
+        metadata: BlockMetadata,
+    ) -> None:
+        """Store response validators for conditional metadata polling."""
+        validators = {}
+        if etag := headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+
+        if not validators:
+            self._metadata_cache.pop(block_id, None)
+            return
+
+        self._metadata_cache[block_id] = (validators, metadata)
+        self._metadata_cache.move_to_end(block_id)
+        if len(self._metadata_cache) > METADATA_CACHE_SIZE:
+            self._metadata_cache.popitem(last=False)
+
     async def verify_block_exists(self, block_id: str) -> bool:
         """
         Verify a block exists on the Tangle.
@@ -327,15 +454,7 @@ class IOTAClient:
 
     async def _submit_block_with_retry(self, message: AnchorMessage) -> str:
         """Submit block with retry logic."""
-        async for attempt in AsyncRetrying(
-            stop=stop_after_attempt(settings.IOTA_RETRY_COUNT),
-            wait=wait_exponential(
-                multiplier=settings.IOTA_RETRY_DELAY,
-                max=settings.IOTA_RETRY_MAX_DELAY,
-            ),
-            retry=retry_if_exception_type((httpx.HTTPError, IOTAClientError)),
-            reraise=True,
-        ):
+        async for attempt in AsyncRetrying(**self._retry_config):
             with attempt:
                 return await self._submit_tagged_data_block(message)
 
@@ -352,27 +471,19 @@ class IOTAClient:
         Returns:
             Block ID of the submitted block
         """
-        # Encode tag as bytes (hex string)
-        tag_bytes = self._tag.encode("utf-8").hex()
-        data_bytes = message.to_bytes().hex()
-
-        # Build tagged data payload
-        payload = {
-            "type": 5,  # Tagged Data payload type
-            "tag": tag_bytes,
-            "data": data_bytes,
-        }
-
-        # Build block
         block = {
             "protocolVersion": 2,
-            "payload": payload,
+            "payload": {
+                "type": 5,  # Tagged Data payload type
+                "tag": self._tag_hex,
+                "data": message.data_hex,
+            },
         }
 
         try:
             response = await self._client.post(
                 "/api/core/v2/blocks",
-                json=block,
+                content=orjson.dumps(block),
                 timeout=settings.IOTA_API_TIMEOUT,
             )
             response.raise_for_status()
@@ -407,8 +518,8 @@ class IOTAClient:
         Raises:
             ConfirmationError: If timeout or conflicting state
         """
-        start_time = asyncio.get_event_loop().time()
-        poll_interval = settings.IOTA_CONFIRMATION_POLL_INTERVAL
+        start_time = time.monotonic()
+        attempt = 0
 
         logger.info(
             "Waiting for block confirmation",
@@ -417,7 +528,7 @@ class IOTAClient:
         )
 
         while True:
-            elapsed = asyncio.get_event_loop().time() - start_time
+            elapsed = time.monotonic() - start_time
             if elapsed >= timeout:
                 raise ConfirmationError(
                     f"Block confirmation timeout after {timeout}s"
@@ -438,12 +549,35 @@ class IOTAClient:
                 if metadata.ledger_inclusion_state == "conflicting":
                     raise ConfirmationError("Block has conflicting state")
 
-                # Still pending, continue polling
-                await asyncio.sleep(poll_interval)
-
             except IOTAClientError:
                 # Node error, retry after delay
-                await asyncio.sleep(poll_interval)
+                pass
+
+            # Still pending, back off before polling again
+            await asyncio.sleep(_confirmation_poll_delay(attempt))
+            attempt += 1
+
+    async def wait_for_confirmations(
+        self,
+        block_ids: list[str],
+        timeout: int = settings.IOTA_CONFIRMATION_TIMEOUT,
+    ) -> list[BlockMetadata]:
+        """
+        Wait for several blocks to confirm, polling them concurrently.
+
+        Args:
+            block_ids: Block IDs to monitor
+            timeout: Maximum wait time in seconds per block
+
+        Returns:
+            Final BlockMetadata for each block, in input order
+
+        Raises:
+            ConfirmationError: If any block times out or conflicts
+        """
+        return await asyncio.gather(
+            *(self._wait_for_confirmation(block_id, timeout) for block_id in block_ids)
+        )
 
     async def get_tips(self) -> list[str]:
         """Get current tips from the node."""
@@ -467,4 +601,4 @@ class IOTAClient:
         Returns:
             URL to view block in explorer
         """
-        return f"{settings.IOTA_EXPLORER_URL}/block/{block_id}"
+        return build_explorer_url(block_id)
@@ -4,20 +4,34 @@ ARED Edge IOTA Anchor Service - Reconciliation
 Handles retry and recovery for failed anchoring operations.
 """
 
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any
+from datetime import UTC, datetime, timedelta
+from typing import Any, TypeVar
+from uuid import UUID
 
 import structlog
 from prometheus_client import Counter, Gauge
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.logging import DigestPreview
 from app.db.repository import AnchorRepository
-from app.services.anchor_service import AnchorRecord, AnchorService, AnchorStatus
+from app.services.anchor_service import (
+    AnchorRecord,
+    AnchorService,
+    AnchorServiceError,
+    AnchorStatus,
+)
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
 # Prometheus metrics
 RECONCILIATION_RUNS = Counter(
     "anchor_reconciliation_runs_total",
@@ -36,6 +50,79 @@ FAILED_ANCHORS = Gauge(
     "anchor_failed_count",
     "Number of failed anchors",
 )
+CIRCUIT_OPEN = Gauge(
+    "anchor_reconciliation_circuit_open",
+    "IOTA circuit breaker state (1=open, 0=closed)",
+)
+
+# Pre-bound label children for the retry outcome counter
+_RETRIES_EXHAUSTED = RECONCILIATION_RETRIES.labels(status="exhausted")
+_RETRIES_SUCCESS = RECONCILIATION_RETRIES.labels(status="success")
+_RETRIES_FAILED = RECONCILIATION_RETRIES.labels(status="failed")
+
+_Q_RETRY_STATS = text("""
+    SELECT anchor_id,
+           COUNT(*) AS retries,
+           MAX(created_at) AS last_attempt,
+           (ARRAY_AGG(next_retry_at ORDER BY created_at DESC))[1] AS next_retry_at
+    FROM anchor_retry_log
+    WHERE anchor_id = ANY(:anchor_ids)
+    GROUP BY anchor_id
+""")
+
+_INSERT_RETRY_LOG = text("""
+    INSERT INTO anchor_retry_log (anchor_id, created_at, next_retry_at)
+    VALUES (:anchor_id, :created_at, :next_retry_at)
+""")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for IOTA node calls made during reconciliation.
+
+    Opens after a run of consecutive failures and rejects calls until the
+    recovery timeout has elapsed. Calls are then let through again
+    (half-open): a success closes the circuit, a failure re-opens it.
+    """
+
+    def __init__(self, fail_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            fail_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds to reject calls once open
+        """
+        self._fail_threshold = fail_threshold
+        self._recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    def is_open(self) -> bool:
+        """Check whether calls should currently be rejected."""
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self._recovery_timeout
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+        CIRCUIT_OPEN.set(0)
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= self._fail_threshold:
+            self._opened_at = time.monotonic()
+            CIRCUIT_OPEN.set(1)
+
+
+# Shared across runs so a node outage is remembered between cycles
+_iota_breaker = CircuitBreaker(
+    fail_threshold=settings.IOTA_CIRCUIT_FAIL_THRESHOLD,
+    recovery_timeout=settings.IOTA_CIRCUIT_RECOVERY_TIMEOUT,
+)
 
 
 @dataclass
@@ -59,6 +146,63 @@ class ReconciliationResult:
         }
 
 
+@dataclass(slots=True)
+class RetryStats:
+    """Retry history for an anchor."""
+
+    retries: int = 0
+    last_attempt: datetime | None = None
+    next_retry_at: datetime | None = None
+
+
+# Retry history by anchor -> (monotonic expiry, stats). It changes only when
+# an anchor is retried, which this process writes through, so the failed
+# bucket only queries anchors it has not seen recently
+RETRY_STATS_CACHE_MAX_SIZE = 4096
+_retry_stats_cache: dict[UUID, tuple[float, RetryStats]] = {}
+
+
+def _cached_retry_stats(anchor_id: UUID) -> RetryStats | None:
+    """Get cached retry history, if present and within the TTL."""
+    entry = _retry_stats_cache.get(anchor_id)
+    if entry is None:
+        return None
+    expires_at, stats = entry
+    if expires_at <= time.monotonic():
+        del _retry_stats_cache[anchor_id]
+        return None
+    return stats
+
+
+def _cache_retry_stats(anchor_id: UUID, stats: RetryStats) -> None:
+    """Cache retry history, evicting the oldest entry when full."""
+    _retry_stats_cache.pop(anchor_id, None)
+    if len(_retry_stats_cache) >= RETRY_STATS_CACHE_MAX_SIZE:
+        del _retry_stats_cache[next(iter(_retry_stats_cache))]
+    _retry_stats_cache[anchor_id] = (
+        time.monotonic() + settings.RETRY_STATS_CACHE_TTL,
+        stats,
+    )
+
+
+def _delay_schedule(base: float, max_delay: float) -> tuple[float, ...]:
+    """
+    Precompute exponential backoff ceilings.
+
+    The table stops at the first capped entry, which then applies to every
+    higher retry count.
+    """
+    schedule = [min(base, max_delay)]
+    while schedule[-1] < max_delay and len(schedule) < 64:
+        schedule.append(min(base * 2 ** len(schedule), max_delay))
+    return tuple(schedule)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
 class ReconciliationService:
     """
     Handles reconciliation of anchor states.
@@ -77,6 +221,8 @@ class ReconciliationService:
         max_retries: int = 3,
         retry_delay_base: float = 60.0,
         retry_delay_max: float = 3600.0,
+        concurrency: int = 10,
+        page_size: int = 500,
     ) -> None:
         """
         Initialize reconciliation service.
@@ -87,6 +233,8 @@ class ReconciliationService:
             max_retries: Maximum retry attempts
             retry_delay_base: Base delay between retries (seconds)
             retry_delay_max: Maximum delay between retries (seconds)
+            concurrency: Maximum anchors processed at once
+            page_size: Anchors fetched per page when walking a status bucket
         """
         self._session = session
         self._anchor_service = anchor_service
@@ -94,13 +242,23 @@ class ReconciliationService:
         self._max_retries = max_retries
         self._retry_delay_base = retry_delay_base
         self._retry_delay_max = retry_delay_max
+        self._delay_schedule = _delay_schedule(retry_delay_base, retry_delay_max)
+        self._concurrency = asyncio.Semaphore(concurrency)
+        self._page_size = page_size
+        # Anchors already processed this cycle, whichever bucket they were in
+        self._handled: set[UUID] = set()
+        # Anchors are processed concurrently but share one session, which
+        # must not be used by more than one task at a time
+        self._db_lock = asyncio.Lock()
+        # Retry attempts recorded this cycle, written in one batch at the end
+        self._pending_retry_log: list[dict[str, Any]] = []
 
     async def run_reconciliation(self) -> ReconciliationResult:
         """
         Run a complete reconciliation cycle.
 
         Steps:
-        1. Check pending anchors for retry
+        1. Retry pending anchors whose backoff has elapsed
         2. Check posted anchors for confirmation
         3. Mark persistent failures for review
 
@@ -110,6 +268,7 @@ class ReconciliationService:
         logger.info("Starting reconciliation run")
         RECONCILIATION_RUNS.inc()
 
+        now = datetime.now(UTC)
         processed = 0
         retried = 0
         confirmed = 0
@@ -117,40 +276,65 @@ class ReconciliationService:
         marked_for_review = 0
 
         try:
+            # The first page of each bucket and the backlog counts are
+            # independent reads, so each runs on its own session and they
+            # overlap instead of costing one round trip each
+            stats: dict[UUID, RetryStats] = {}
+            (
+                pending,
+                pending_count,
+                posted,
+                failed_anchors,
+                failed_count,
+            ) = await asyncio.gather(
+                self._list_due_anchors(stats),
+                self._read(
+                    lambda repository: repository.count_anchors(
+                        status=AnchorStatus.PENDING
+                    )
+                ),
+                self._get_anchors_by_status(AnchorStatus.POSTED),
+                self._get_anchors_by_status(AnchorStatus.FAILED),
+                self._read(
+                    lambda repository: repository.count_anchors(
+                        status=AnchorStatus.FAILED
+                    )
+                ),
+            )
+            PENDING_ANCHORS.set(pending_count)
+            FAILED_ANCHORS.set(failed_count)
+
             # Process pending anchors (retry failures)
-            pending = await self._get_anchors_by_status(AnchorStatus.PENDING)
-            PENDING_ANCHORS.set(len(pending))
-
-            for anchor in pending:
-                processed += 1
-                result = await self._process_pending_anchor(anchor)
-                if result == "retried":
-                    retried += 1
-                elif result == "failed":
-                    failed += 1
-                elif result == "review":
-                    marked_for_review += 1
+            outcomes = await self._process_bucket(
+                pending,
+                lambda after: self._list_due_anchors(stats, after),
+                lambda page: self._process_concurrently(
+                    page, self._process_pending_anchor, stats, now
+                ),
+            )
+            processed += len(outcomes)
+            retried += outcomes.count("retried")
+            failed += outcomes.count("failed")
+            marked_for_review += outcomes.count("review")
 
             # Process posted anchors (check confirmation)
-            posted = await self._get_anchors_by_status(AnchorStatus.POSTED)
-
-            for anchor in posted:
-                processed += 1
-                result = await self._check_confirmation(anchor)
-                if result == "confirmed":
-                    confirmed += 1
+            outcomes = await self._process_bucket(
+                posted,
+                lambda after: self._get_anchors_by_status(AnchorStatus.POSTED, after),
+                lambda page: self._process_concurrently(page, self._check_confirmation),
+            )
+            processed += len(outcomes)
+            confirmed += outcomes.count("confirmed")
 
             # Process failed anchors
-            failed_anchors = await self._get_anchors_by_status(AnchorStatus.FAILED)
-            FAILED_ANCHORS.set(len(failed_anchors))
-
-            for anchor in failed_anchors:
-                processed += 1
-                result = await self._process_failed_anchor(anchor)
-                if result == "retried":
-                    retried += 1
-                elif result == "review":
-                    marked_for_review += 1
+            outcomes = await self._process_bucket(
+                failed_anchors,
+                lambda after: self._get_anchors_by_status(AnchorStatus.FAILED, after),
+                lambda page: self._process_failed_page(page, now),
+            )
+            processed += len(outcomes)
+            retried += outcomes.count("retried")
+            marked_for_review += outcomes.count("review")
 
             logger.info(
                 "Reconciliation completed",
@@ -179,43 +363,203 @@ class ReconciliationService:
                 marked_for_review=marked_for_review,
             )
 
+        finally:
+            # Anchors already re-posted must not lose their attempt record
+            await self._flush_retry_log()
+
+    async def _process_concurrently(
+        self,
+        anchors: list[AnchorRecord],
+        handler: Callable[..., Awaitable[str]],
+        *args: Any,
+    ) -> list[str]:
+        """
+        Run a handler over anchors concurrently, bounded by the semaphore.
+
+        Args:
+            anchors: Anchors to process
+            handler: Per-anchor coroutine returning an outcome string
+            *args: Extra arguments passed to the handler
+
+        Returns:
+            Outcome per anchor; unexpected errors are reported as "failed"
+
+        Raises:
+            asyncio.CancelledError: If a handler was cancelled
+        """
+
+        async def guarded(anchor: AnchorRecord) -> str:
+            async with self._concurrency:
+                return await handler(anchor, *args)
+
+        results = await asyncio.gather(
+            *(guarded(anchor) for anchor in anchors),
+            return_exceptions=True,
+        )
+
+        outcomes = []
+        for anchor, result in zip(anchors, results, strict=True):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    # Cancellation (and interpreter exit) must propagate,
+                    # not be tallied as an anchor outcome
+                    raise result
+                logger.error(
+                    "Anchor reconciliation failed",
+                    anchor_id=str(anchor.id),
+                    error=str(result),
+                )
+                outcomes.append("failed")
+            else:
+                outcomes.append(result)
+        return outcomes
+
     async def _get_anchors_by_status(
         self,
         status: AnchorStatus,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[AnchorRecord]:
-        """Get anchors with a specific status."""
-        return await self._repository.list_anchors(
-            status=status.value,
-            limit=100,
+        """Get one page of anchors with a specific status."""
+        return await self._read(
+            lambda repository: repository.list_anchors_page(
+                status=status,
+                after=after,
+                limit=self._page_size,
+            )
         )
 
-    async def _process_pending_anchor(self, anchor: AnchorRecord) -> str:
+    async def _list_due_anchors(
+        self,
+        stats: dict[UUID, RetryStats],
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[AnchorRecord]:
+        """
+        Get one page of pending anchors whose backoff has elapsed.
+
+        Args:
+            stats: Filled with the retry history of the returned anchors
+            after: Cursor of the last anchor on the previous page
+
+        Returns:
+            Due anchors, oldest first
+        """
+        due = await self._read(
+            lambda repository: repository.list_due_anchors(
+                status=AnchorStatus.PENDING,
+                base=self._retry_delay_base,
+                max_delay=self._retry_delay_max,
+                limit=self._page_size,
+                after=after,
+            )
+        )
+        for record, retries, last_attempt, next_retry_at in due:
+            stats[record.id] = RetryStats(retries, last_attempt, next_retry_at)
+            _cache_retry_stats(record.id, stats[record.id])
+        return [record for record, *_ in due]
+
+    async def _process_failed_page(
+        self,
+        anchors: list[AnchorRecord],
+        now: datetime,
+    ) -> list[str]:
+        """Load retry history for a page of failed anchors and process it."""
+        stats = await self._load_retry_stats([a.id for a in anchors])
+        return await self._process_concurrently(
+            anchors, self._process_failed_anchor, stats, now
+        )
+
+    async def _process_bucket(
+        self,
+        first_page: list[AnchorRecord],
+        fetch_page: Callable[[tuple[datetime, UUID]], Awaitable[list[AnchorRecord]]],
+        process_page: Callable[[list[AnchorRecord]], Awaitable[list[str]]],
+    ) -> list[str]:
+        """
+        Process every anchor in a status bucket, one keyset page at a time.
+
+        Only one page is held at once, and a short page marks the end of
+        the bucket. Status updates for a page are committed together.
+        Anchors that moved here from a bucket processed earlier in the cycle
+        are skipped.
+
+        Args:
+            first_page: Prefetched first page of the bucket
+            fetch_page: Fetches the page after a (created_at, id) cursor
+            process_page: Processes a page, returning one outcome per anchor
+
+        Returns:
+            Outcome per processed anchor
+        """
+        outcomes: list[str] = []
+        page = first_page
+        while True:
+            fresh = [anchor for anchor in page if anchor.id not in self._handled]
+            self._handled.update(anchor.id for anchor in fresh)
+            if fresh:
+                outcomes += await process_page(fresh)
+                # Status changes for the whole page share one commit
+                await self._session.commit()
+            if len(page) < self._page_size:
+                return outcomes
+            last = page[-1]
+            page = await fetch_page((last.created_at, last.id))
+
+    async def _read(self, query: Callable[[AnchorRepository], Awaitable[T]]) -> T:
+        """
+        Run a read-only query on a short-lived session.
+
+        Sessions are cheap against the shared engine, whose pool hands out
+        the connections, so independent reads can run concurrently.
+
+        Args:
+            query: Coroutine function taking a repository
+
+        Returns:
+            The query result
+        """
+        async with AsyncSession(bind=self._session.bind) as session:
+            return await query(AnchorRepository(session))
+
+    async def _process_pending_anchor(
+        self,
+        anchor: AnchorRecord,
+        stats: dict[UUID, RetryStats],
+        now: datetime,
+    ) -> str:
         """
         Process a pending anchor.
 
+        Args:
+            anchor: Pending anchor
+            stats: Retry history by anchor ID
+            now: Current time (UTC), captured once per cycle
+
         Returns:
             "retried", "failed", or "review"
         """
-        retry_count = await self._get_retry_count(anchor.id)
+        anchor_stats = stats.get(anchor.id) or RetryStats()
+        retry_count = anchor_stats.retries
 
         if retry_count >= self._max_retries:
             # Mark for manual review
             await self._mark_for_review(anchor)
-            RECONCILIATION_RETRIES.labels(status="exhausted").inc()
+            _RETRIES_EXHAUSTED.inc()
             return "review"
 
-        # Calculate backoff delay
-        delay = self._calculate_backoff(retry_count)
-        last_attempt = await self._get_last_attempt_time(anchor.id)
-
-        if last_attempt and (datetime.utcnow() - last_attempt).total_seconds() < delay:
+        # Wait out the backoff sampled when the last attempt was recorded
+        next_retry_at = self._next_retry_time(anchor_stats)
+        if next_retry_at and now < next_retry_at:
             # Not time to retry yet
             return "pending"
 
+        if _iota_breaker.is_open():
+            # Leave it for a later cycle rather than adding to the outage
+            return "pending"
+
         # Retry posting
         try:
-            await self._retry_anchor(anchor)
-            RECONCILIATION_RETRIES.labels(status="success").inc()
+            await self._retry_anchor(anchor, retry_count)
+            _RETRIES_SUCCESS.inc()
             return "retried"
         except Exception as e:
             logger.error(
@@ -224,30 +568,46 @@ class ReconciliationService:
                 error=str(e),
             )
             await self._record_failure(anchor.id, str(e))
-            RECONCILIATION_RETRIES.labels(status="failed").inc()
+            _RETRIES_FAILED.inc()
             return "failed"
 
-    async def _process_failed_anchor(self, anchor: AnchorRecord) -> str:
+    async def _process_failed_anchor(
+        self,
+        anchor: AnchorRecord,
+        stats: dict[UUID, RetryStats],
+        now: datetime,
+    ) -> str:
         """
         Process a failed anchor for potential retry.
 
+        Args:
+            anchor: Failed anchor
+            stats: Retry history by anchor ID
+            now: Current time (UTC), captured once per cycle
+
         Returns:
             "retried" or "review"
         """
-        retry_count = await self._get_retry_count(anchor.id)
+        anchor_stats = stats.get(anchor.id) or RetryStats()
+        retry_count = anchor_stats.retries
 
         if retry_count >= self._max_retries:
             return "review"
 
         # Only retry if enough time has passed
-        delay = self._calculate_backoff(retry_count)
-        if anchor.created_at:
-            age = (datetime.utcnow() - anchor.created_at).total_seconds()
-            if age < delay:
-                return "waiting"
+        next_retry_at = self._next_retry_time(anchor_stats)
+        if next_retry_at is None and anchor.created_at:
+            next_retry_at = _as_utc(anchor.created_at) + timedelta(
+                seconds=self._backoff_cap(retry_count)
+            )
+        if next_retry_at and now < next_retry_at:
+            return "waiting"
+
+        if _iota_breaker.is_open():
+            return "waiting"
 
         try:
-            await self._retry_anchor(anchor)
+            await self._retry_anchor(anchor, retry_count)
             return "retried"
         except Exception:
             return "review"
@@ -262,17 +622,27 @@ class ReconciliationService:
         if not anchor.iota_block_id:
             return "failed"
 
-        try:
-            confirmed_record = await self._anchor_service.check_confirmation(
-                anchor_id=anchor.id,
-                block_id=anchor.iota_block_id,
-            )
+        if _iota_breaker.is_open():
+            return "pending"
 
-            if confirmed_record.status == AnchorStatus.CONFIRMED:
-                await self._repository.update_anchor_status(
+        try:
+            try:
+                confirmed_record = await self._anchor_service.check_confirmation(
                     anchor_id=anchor.id,
-                    status=AnchorStatus.CONFIRMED,
+                    block_id=anchor.iota_block_id,
                 )
+            except AnchorServiceError:
+                _iota_breaker.record_failure()
+                raise
+            _iota_breaker.record_success()
+
+            if confirmed_record.status == AnchorStatus.CONFIRMED:
+                async with self._db_lock:
+                    await self._repository.update_anchor_status(
+                        anchor_id=anchor.id,
+                        status=AnchorStatus.CONFIRMED,
+                        commit=False,
+                    )
                 logger.info(
                     "Anchor confirmed",
                     anchor_id=str(anchor.id),
@@ -290,56 +660,86 @@ class ReconciliationService:
             )
             return "failed"
 
-    async def _retry_anchor(self, anchor: AnchorRecord) -> None:
+    async def _retry_anchor(self, anchor: AnchorRecord, retry_count: int) -> None:
         """
         Retry posting an anchor to IOTA.
 
         Args:
             anchor: Anchor to retry
+            retry_count: Number of previous retries
         """
         logger.info(
             "Retrying anchor",
             anchor_id=str(anchor.id),
-            digest=anchor.digest[:16] + "...",
+            digest=DigestPreview(anchor.digest),
         )
 
         # Re-post to IOTA
-        new_record = await self._anchor_service.create_anchor(
-            digest=anchor.digest,
-            item_count=anchor.item_count,
-            start_time=anchor.start_time,
-            end_time=anchor.end_time,
-            method=anchor.method,
-            wait_for_confirmation=True,
-        )
+        try:
+            new_record = await self._anchor_service.create_anchor(
+                digest=anchor.digest,
+                item_count=anchor.item_count,
+                start_time=anchor.start_time,
+                end_time=anchor.end_time,
+                method=anchor.method,
+                wait_for_confirmation=True,
+            )
+        except AnchorServiceError:
+            _iota_breaker.record_failure()
+            raise
+        _iota_breaker.record_success()
 
         # Update existing anchor record
-        await self._repository.update_anchor_status(
-            anchor_id=anchor.id,
-            status=new_record.status,
-            iota_block_id=new_record.iota_block_id,
-        )
+        async with self._db_lock:
+            await self._repository.update_anchor_status(
+                anchor_id=anchor.id,
+                status=new_record.status,
+                iota_block_id=new_record.iota_block_id,
+                commit=False,
+            )
 
-        # Record retry attempt
-        await self._record_retry_attempt(anchor.id)
+        # Record retry attempt and when the next one may run
+        self._record_retry_attempt(
+            anchor.id,
+            delay=self._calculate_backoff(retry_count + 1),
+            retries=retry_count + 1,
+        )
 
     async def _mark_for_review(self, anchor: AnchorRecord) -> None:
         """Mark an anchor for manual review."""
-        await self._repository.update_anchor_status(
-            anchor_id=anchor.id,
-            status=AnchorStatus.FAILED,
-            error_message="Max retries exceeded - requires manual review",
-        )
+        async with self._db_lock:
+            await self._repository.update_anchor_status(
+                anchor_id=anchor.id,
+                status=AnchorStatus.FAILED,
+                error_message="Max retries exceeded - requires manual review",
+                commit=False,
+            )
 
         logger.warning(
             "Anchor marked for review",
             anchor_id=str(anchor.id),
-            digest=anchor.digest[:16] + "...",
+            digest=DigestPreview(anchor.digest),
         )
 
+    def _backoff_cap(self, retry_count: int) -> float:
+        """
+        Calculate the exponential backoff ceiling.
+
+        Args:
+            retry_count: Number of previous retries
+
+        Returns:
+            Maximum delay in seconds
+        """
+        schedule = self._delay_schedule
+        return schedule[min(retry_count, len(schedule) - 1)]
+
     def _calculate_backoff(self, retry_count: int) -> float:
         """
-        Calculate exponential backoff delay.
+        Calculate a full-jitter backoff delay.
+
+        The delay is drawn uniformly from zero to the exponential ceiling,
+        so anchors failing in the same cycle do not retry in lockstep.
 
         Args:
             retry_count: Number of previous retries
@@ -347,62 +747,130 @@ class ReconciliationService:
         Returns:
             Delay in seconds
         """
-        delay = self._retry_delay_base * (2 ** retry_count)
-        return min(delay, self._retry_delay_max)
+        return random.uniform(0, self._backoff_cap(retry_count))
 
-    async def _get_retry_count(self, anchor_id) -> int:
-        """Get number of retry attempts for an anchor."""
-        try:
-            query = text("""
-                SELECT COUNT(*) as count
-                FROM anchor_retry_log
-                WHERE anchor_id = :anchor_id
-            """)
-            result = await self._session.execute(query, {"anchor_id": anchor_id})
-            row = result.fetchone()
-            return row.count if row else 0
-        except Exception:
-            return 0
+    async def _load_retry_stats(
+        self,
+        anchor_ids: list[UUID],
+    ) -> dict[UUID, RetryStats]:
+        """
+        Load retry history for a batch of anchors in one query.
+
+        Cached history is used where available; only the remaining anchors
+        are queried.
+
+        Args:
+            anchor_ids: Anchors to look up
+
+        Returns:
+            RetryStats by anchor ID; omitted if the lookup failed
+        """
+        stats: dict[UUID, RetryStats] = {}
+        missing = []
+        for anchor_id in anchor_ids:
+            cached = _cached_retry_stats(anchor_id)
+            if cached is None:
+                missing.append(anchor_id)
+            else:
+                stats[anchor_id] = cached
+
+        if not missing:
+            return stats
 
-    async def _get_last_attempt_time(self, anchor_id) -> datetime | None:
-        """Get time of last retry attempt."""
         try:
-            query = text("""
-                SELECT created_at
-                FROM anchor_retry_log
-                WHERE anchor_id = :anchor_id
-                ORDER BY created_at DESC
-                LIMIT 1
-            """)
-            result = await self._session.execute(query, {"anchor_id": anchor_id})
-            row = result.fetchone()
-            return row.created_at if row else None
-        except Exception:
+            result = await self._session.execute(
+                _Q_RETRY_STATS, {"anchor_ids": missing}
+            )
+            loaded = {
+                row.anchor_id: RetryStats(
+                    retries=row.retries,
+                    last_attempt=row.last_attempt,
+                    next_retry_at=row.next_retry_at,
+                )
+                for row in result
+            }
+        except Exception as e:
+            logger.warning("Failed to load retry stats", error=str(e))
+            return stats
+
+        for anchor_id in missing:
+            # Anchors never retried are cached too, as empty history
+            stats[anchor_id] = loaded.get(anchor_id) or RetryStats()
+            _cache_retry_stats(anchor_id, stats[anchor_id])
+        return stats
+
+    def _next_retry_time(self, stats: RetryStats) -> datetime | None:
+        """
+        Get the earliest time the next retry may run.
+
+        Uses the delay sampled when the last attempt was recorded, falling
+        back to the backoff ceiling for attempts logged without one.
+        """
+        if stats.next_retry_at is not None:
+            return _as_utc(stats.next_retry_at)
+        if stats.last_attempt is None:
             return None
+        return _as_utc(stats.last_attempt) + timedelta(
+            seconds=self._backoff_cap(stats.retries)
+        )
 
-    async def _record_retry_attempt(self, anchor_id) -> None:
-        """Record a retry attempt."""
+    def _record_retry_attempt(
+        self,
+        anchor_id: UUID,
+        delay: float,
+        retries: int,
+    ) -> None:
+        """
+        Record a retry attempt for the end-of-cycle batch insert.
+
+        Args:
+            anchor_id: Anchor that was retried
+            delay: Sampled backoff before the next retry (seconds)
+            retries: Retry count including this attempt
+        """
+        now = datetime.now(UTC)
+        next_retry_at = now + timedelta(seconds=delay)
+        self._pending_retry_log.append(
+            {
+                "anchor_id": anchor_id,
+                "created_at": now,
+                "next_retry_at": next_retry_at,
+            }
+        )
+        _cache_retry_stats(anchor_id, RetryStats(retries, now, next_retry_at))
+
+    async def _flush_retry_log(self) -> None:
+        """Insert the retry attempts recorded this cycle in one transaction."""
+        if not self._pending_retry_log:
+            return
+
+        rows, self._pending_retry_log = self._pending_retry_log, []
         try:
-            query = text("""
-                INSERT INTO anchor_retry_log (anchor_id, created_at)
-                VALUES (:anchor_id, :created_at)
-            """)
-            await self._session.execute(
-                query,
-                {"anchor_id": anchor_id, "created_at": datetime.utcnow()},
-            )
+            # A list of parameter sets is sent as one asyncpg executemany
+            # inside the session's transaction
+            await self._session.execute(_INSERT_RETRY_LOG, rows)
             await self._session.commit()
         except Exception as e:
-            logger.warning("Failed to record retry attempt", error=str(e))
+            await self._session.rollback()
+            # The cache must not run ahead of the log it mirrors
+            for row in rows:
+                _retry_stats_cache.pop(row["anchor_id"], None)
+            logger.warning(
+                "Failed to record retry attempts",
+                count=len(rows),
+                error=str(e),
+            )
 
     async def _record_failure(self, anchor_id, error: str) -> None:
         """Record a failure for an anchor."""
         try:
-            await self._repository.update_anchor_status(
-                anchor_id=anchor_id,
-                status=AnchorStatus.FAILED,
-                error_message=error,
-            )
+            async with self._db_lock:
+                await self._repository.update_anchor_status(
+                    anchor_id=anchor_id,
+                    status=AnchorStatus.FAILED,
+                    error_message=error,
+                    commit=False,
+                )
         except Exception as e:
             logger.warning("Failed to record failure", error=str(e))
 
@@ -419,8 +887,20 @@ async def ensure_retry_log_table(session: AsyncSession) -> None:
     """))
 
     await session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_anchor_retry_log_anchor_id
-        ON anchor_retry_log(anchor_id)
+        ALTER TABLE anchor_retry_log
+        ADD COLUMN IF NOT EXISTS next_retry_at TIMESTAMPTZ
+    """))
+
+    # Serves per-anchor retry history (count, latest attempt and its
+    # next_retry_at) from the index alone; supersedes the anchor_id index
+    await session.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_anchor_retry_log_anchor_created
+        ON anchor_retry_log(anchor_id, created_at DESC)
+        INCLUDE (next_retry_at)
+    """))
+
+    await session.execute(text("""
+        DROP INDEX IF EXISTS idx_anchor_retry_log_anchor_id
     """))
 
     await session.commit()
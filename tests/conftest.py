@@ -2,34 +2,30 @@
 Pytest configuration and shared fixtures for IOTA anchor tests.
 """
 
-import asyncio
 from collections.abc import Generator
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import httpx
 import pytest
 
+from app.crypto.merkle import MerkleTree
 from app.services.iota_client import AnchorMessage, BlockMetadata, IOTAClient
 from app.services.anchor_service import AnchorRecord, AnchorService, AnchorStatus
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an event loop for the test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
 def mock_httpx_client() -> AsyncMock:
     """Create a mock httpx client."""
-    client = AsyncMock()
-    client.get = AsyncMock()
-    client.post = AsyncMock()
-    client.aclose = AsyncMock()
-    return client
+    return AsyncMock(spec=httpx.AsyncClient)
+
+
+@pytest.fixture
+def patched_httpx(mock_httpx_client: AsyncMock) -> Generator[MagicMock, None, None]:
+    """Patch httpx.AsyncClient so clients built in connect() are the mock."""
+    with patch("httpx.AsyncClient", return_value=mock_httpx_client) as client_class:
+        yield client_class
 
 
 @pytest.fixture
@@ -87,3 +83,13 @@ def iota_client() -> IOTAClient:
 def anchor_service() -> AnchorService:
     """Create an anchor service for testing."""
     return AnchorService()
+
+
+@pytest.fixture(scope="session")
+def merkle_trees() -> dict[int, MerkleTree]:
+    """Build shared Merkle trees of leaf{i} leaves, keyed by leaf count."""
+    counts = [1, 2, 3, 4, 5, 7, 8, 9, 11, 13, 16, 32, 100]
+    return {
+        count: MerkleTree.from_leaves([f"leaf{i}".encode() for i in range(count)])
+        for count in counts
+    }
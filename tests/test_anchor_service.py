@@ -13,6 +13,7 @@ from app.services.anchor_service import (
     AnchorService,
     AnchorServiceError,
     AnchorStatus,
+    digest_algorithm_for,
 )
 from app.services.iota_client import (
     BlockMetadata,
@@ -35,6 +36,23 @@ class TestAnchorStatus:
         assert AnchorStatus.FAILED.value == "failed"
 
 
+class TestDigestMethods:
+    """Tests for digest method resolution."""
+
+    @pytest.mark.parametrize(
+        ("method", "algorithm"),
+        [
+            ("merkle_sha256", "sha256"),
+            ("merkle_blake3", "blake3"),
+            ("sha256", "sha256"),
+            ("custom", "custom"),
+        ],
+    )
+    def test_digest_algorithm_for(self, method: str, algorithm: str) -> None:
+        """Test method to algorithm mapping."""
+        assert digest_algorithm_for(method) == algorithm
+
+
 class TestAnchorRecord:
     """Tests for AnchorRecord."""
 
@@ -55,6 +73,18 @@ class TestAnchorRecord:
         assert data["status"] == "pending"
         assert "created_at" in data
 
+    def test_explorer_url_derived_from_block_id(
+        self, sample_anchor_record: AnchorRecord
+    ) -> None:
+        """Test that the explorer URL is built lazily from the block ID."""
+        assert sample_anchor_record.to_dict()["explorer_url"] is None
+
+        sample_anchor_record.iota_block_id = "0xabc"
+        data = sample_anchor_record.to_dict()
+
+        assert data["explorer_url"].endswith("/block/0xabc")
+        assert sample_anchor_record.explorer_url is None
+
     def test_default_created_at(self) -> None:
         """Test default created_at timestamp."""
         record = AnchorRecord(
@@ -78,7 +108,6 @@ class TestAnchorService:
         assert anchor_service._iota_client is not None
         assert anchor_service._pending_anchors == {}
 
-    @pytest.mark.asyncio
     async def test_initialize(self, anchor_service: AnchorService) -> None:
         """Test service initialization."""
         with patch.object(
@@ -88,7 +117,6 @@ class TestAnchorService:
         ):
             await anchor_service.initialize()
 
-    @pytest.mark.asyncio
     async def test_shutdown(self, anchor_service: AnchorService) -> None:
         """Test service shutdown."""
         with patch.object(
@@ -98,7 +126,6 @@ class TestAnchorService:
         ):
             await anchor_service.shutdown()
 
-    @pytest.mark.asyncio
     async def test_create_anchor_success(
         self,
         anchor_service: AnchorService,
@@ -133,8 +160,33 @@ class TestAnchorService:
                     assert record is not None
                     assert record.status in (AnchorStatus.POSTED, AnchorStatus.CONFIRMED)
                     assert record.iota_block_id == sample_block_metadata.block_id
+                    assert record.id.version == 7
+
+    async def test_create_anchor_blake3_method(
+        self,
+        anchor_service: AnchorService,
+        sample_block_metadata: BlockMetadata,
+    ) -> None:
+        """Test that the digest method selects the message algorithm."""
+        with patch.object(
+            anchor_service._iota_client,
+            "post_anchor",
+            new_callable=AsyncMock,
+        ) as mock_post:
+            mock_post.return_value = sample_block_metadata
+
+            await anchor_service.create_anchor(
+                digest="abc123" * 10,
+                item_count=100,
+                start_time=datetime(2025, 12, 1),
+                end_time=datetime(2025, 12, 2),
+                method="merkle_blake3",
+            )
+
+            message = mock_post.call_args.kwargs["message"]
+            assert message.digest_algorithm == "blake3"
+            assert message.anchor_type == "merkle_root"
 
-    @pytest.mark.asyncio
     async def test_create_anchor_posting_failure(
         self,
         anchor_service: AnchorService,
@@ -155,7 +207,6 @@ class TestAnchorService:
                     end_time=datetime(2025, 12, 2),
                 )
 
-    @pytest.mark.asyncio
     async def test_check_confirmation(
         self,
         anchor_service: AnchorService,
@@ -177,7 +228,6 @@ class TestAnchorService:
             
             assert record.status == AnchorStatus.CONFIRMED
 
-    @pytest.mark.asyncio
     async def test_verify_anchor_on_tangle(
         self,
         anchor_service: AnchorService,
@@ -194,7 +244,6 @@ class TestAnchorService:
             
             assert exists
 
-    @pytest.mark.asyncio
     async def test_get_node_status_connected(
         self,
         anchor_service: AnchorService,
@@ -228,7 +277,6 @@ class TestAnchorService:
                     assert status["connected"]
                     assert "version" in status
 
-    @pytest.mark.asyncio
     async def test_get_node_status_disconnected(
         self,
         anchor_service: AnchorService,
@@ -240,7 +288,6 @@ class TestAnchorService:
         
         assert not status["connected"]
 
-    @pytest.mark.asyncio
     async def test_run_daily_anchor_no_events(
         self,
         anchor_service: AnchorService,
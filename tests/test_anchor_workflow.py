@@ -2,17 +2,64 @@
 Unit tests for the Anchor Workflow.
 """
 
+import itertools
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
+from typing import TypeVar
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
+from uuid import UUID
 
 import pytest
 
-from app.services.anchor_service import AnchorRecord, AnchorStatus
+from app.services.anchor_service import AnchorRecord, AnchorService, AnchorStatus
 from app.services.anchor_workflow import AnchorResult, AnchorWorkflow
 from app.services.event_consumer import EventWindow, IndexedEvent
 from app.services.iota_client import BlockMetadata
 
+T = TypeVar("T")
+
+# Fixed clock for test data; nothing here depends on time advancing
+_NOW = datetime.utcnow()
+_YESTERDAY = _NOW - timedelta(days=1)
+
+_HEX_A = "a" * 64
+_HEX_B = "b" * 64
+_HEX_C = "c" * 64
+_BLOCK_A = "0x" + _HEX_A
+_BLOCK_B = "0x" + _HEX_B
+_BLOCK_D = "0x" + "d" * 64
+
+_uuid_counter = itertools.count(1)
+
+
+def _fast_uuid() -> UUID:
+    """Distinct, opaque ids without drawing on os.urandom."""
+    return UUID(int=next(_uuid_counter))
+
+
+# Immutable in practice: tests only read these
+_EMPTY_WINDOW = EventWindow(start_time=_YESTERDAY, end_time=_NOW, events=[])
+_SAMPLE_DAILY_RESULT = AnchorResult(
+    success=True,
+    anchor_id=_fast_uuid(),
+    digest=_HEX_A,
+    event_count=100,
+    iota_block_id="0x123",
+    error=None,
+    start_time=_YESTERDAY,
+    end_time=_NOW,
+    duration_seconds=10.0,
+)
+
+
+def _async_return(value: T) -> Callable[..., Awaitable[T]]:
+    """Build a plain coroutine stub for swaps whose calls are not asserted."""
+
+    async def stub(*args: object, **kwargs: object) -> T:
+        return value
+
+    return stub
+
 
 @pytest.fixture
 def mock_session() -> AsyncMock:
@@ -25,233 +72,175 @@ def mock_session() -> AsyncMock:
 @pytest.fixture
 def mock_anchor_service() -> AsyncMock:
     """Create a mock anchor service."""
-    service = AsyncMock()
-    service.create_anchor = AsyncMock()
-    return service
+    return AsyncMock(spec=AnchorService)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_events() -> list[IndexedEvent]:
-    """Create sample indexed events."""
+    """Create sample indexed events (read-only, shared by the module)."""
     return [
         IndexedEvent(
-            id=uuid4(),
+            id=_fast_uuid(),
             block_number=100,
-            block_hash="0x" + "a" * 64,
+            block_hash=_BLOCK_A,
             event_index=0,
             pallet="TelemetryProofs",
             event_name="ProofSubmitted",
             event_data={"device_id": "dev1"},
-            event_hash="a" * 64,
-            timestamp=datetime.utcnow(),
+            event_hash=_HEX_A,
+            timestamp=_NOW,
         ),
         IndexedEvent(
-            id=uuid4(),
+            id=_fast_uuid(),
             block_number=101,
-            block_hash="0x" + "b" * 64,
+            block_hash=_BLOCK_B,
             event_index=0,
             pallet="TelemetryProofs",
             event_name="ProofSubmitted",
             event_data={"device_id": "dev2"},
-            event_hash="b" * 64,
-            timestamp=datetime.utcnow(),
+            event_hash=_HEX_B,
+            timestamp=_NOW,
         ),
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_anchor_record() -> AnchorRecord:
-    """Create a sample anchor record."""
+    """Create a sample anchor record (read-only, shared by the module)."""
     return AnchorRecord(
-        id=uuid4(),
-        digest="c" * 64,
+        id=_fast_uuid(),
+        digest=_HEX_C,
         method="merkle_sha256",
-        start_time=datetime.utcnow() - timedelta(days=1),
-        end_time=datetime.utcnow(),
+        start_time=_YESTERDAY,
+        end_time=_NOW,
         item_count=2,
         status=AnchorStatus.POSTED,
-        iota_block_id="0x" + "d" * 64,
+        iota_block_id=_BLOCK_D,
     )
 
 
 class TestAnchorResult:
     """Tests for AnchorResult."""
 
-    def test_to_dict(self) -> None:
-        """Test serialization."""
-        result = AnchorResult(
-            success=True,
-            anchor_id=uuid4(),
-            digest="a" * 64,
-            event_count=10,
-            iota_block_id="0x123",
-            error=None,
-            start_time=datetime.utcnow(),
-            end_time=datetime.utcnow(),
-            duration_seconds=5.5,
-        )
-
-        data = result.to_dict()
-
-        assert data["success"] is True
-        assert data["event_count"] == 10
-        assert data["duration_seconds"] == 5.5
-
-    def test_to_dict_with_error(self) -> None:
-        """Test serialization with error."""
+    @pytest.mark.parametrize(
+        ("success", "error", "event_count", "duration_seconds"),
+        [(True, None, 10, 5.5), (False, "Connection failed", 0, 1.0)],
+    )
+    def test_to_dict(
+        self,
+        success: bool,
+        error: str | None,
+        event_count: int,
+        duration_seconds: float,
+    ) -> None:
+        """Test serialization of successful and failed results."""
         result = AnchorResult(
-            success=False,
-            anchor_id=None,
-            digest=None,
-            event_count=0,
-            iota_block_id=None,
-            error="Connection failed",
-            start_time=datetime.utcnow(),
-            end_time=datetime.utcnow(),
-            duration_seconds=1.0,
+            success=success,
+            anchor_id=_fast_uuid() if success else None,
+            digest=_HEX_A if success else None,
+            event_count=event_count,
+            iota_block_id="0x123" if success else None,
+            error=error,
+            start_time=_NOW,
+            end_time=_NOW,
+            duration_seconds=duration_seconds,
         )
 
         data = result.to_dict()
 
-        assert data["success"] is False
-        assert data["error"] == "Connection failed"
+        assert data["success"] is success
+        assert data["error"] == error
+        assert data["event_count"] == event_count
+        assert data["duration_seconds"] == duration_seconds
 
 
 class TestAnchorWorkflow:
     """Tests for AnchorWorkflow."""
 
-    @pytest.mark.asyncio
     async def test_run_anchor_job_empty_window(
         self,
         mock_session: AsyncMock,
         mock_anchor_service: AsyncMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test anchor job with no events."""
         workflow = AnchorWorkflow(mock_session, mock_anchor_service)
+        consumer = workflow._event_consumer
+        monkeypatch.setattr(
+            consumer, "fetch_events_for_window", _async_return(_EMPTY_WINDOW)
+        )
+        get_last_anchor_time = AsyncMock(return_value=None)
+        monkeypatch.setattr(consumer, "get_last_anchor_time", get_last_anchor_time)
 
-        with patch.object(
-            workflow._event_consumer,
-            "fetch_events_for_window",
-            new_callable=AsyncMock,
-        ) as mock_fetch:
-            mock_fetch.return_value = EventWindow(
-                start_time=datetime.utcnow() - timedelta(days=1),
-                end_time=datetime.utcnow(),
-                events=[],
-            )
-
-            with patch.object(
-                workflow._event_consumer,
-                "get_last_anchor_time",
-                new_callable=AsyncMock,
-            ) as mock_last:
-                mock_last.return_value = None
-
-                result = await workflow.run_anchor_job()
+        result = await workflow.run_anchor_job()
 
-                assert result.success
-                assert result.event_count == 0
-                assert result.anchor_id is None
+        assert result.success
+        assert result.event_count == 0
+        assert result.anchor_id is None
+        # The window start must not come from another process's stale cache
+        get_last_anchor_time.assert_awaited_once_with(use_cache=False)
 
-    @pytest.mark.asyncio
     async def test_run_anchor_job_success(
         self,
         mock_session: AsyncMock,
         mock_anchor_service: AsyncMock,
         sample_events: list[IndexedEvent],
         sample_anchor_record: AnchorRecord,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test successful anchor job."""
         workflow = AnchorWorkflow(mock_session, mock_anchor_service)
+        window = EventWindow(start_time=_YESTERDAY, end_time=_NOW, events=sample_events)
+        save_anchor_items = AsyncMock()
 
         mock_anchor_service.create_anchor.return_value = sample_anchor_record
+        consumer = workflow._event_consumer
+        monkeypatch.setattr(consumer, "fetch_events_for_window", _async_return(window))
+        monkeypatch.setattr(consumer, "get_last_anchor_time", _async_return(None))
+        repository = workflow._repository
+        monkeypatch.setattr(
+            repository, "save_anchor", _async_return(sample_anchor_record.id)
+        )
+        monkeypatch.setattr(repository, "save_anchor_items", save_anchor_items)
+        monkeypatch.setattr(workflow, "_check_existing_anchor", _async_return(None))
 
-        with patch.object(
-            workflow._event_consumer,
-            "fetch_events_for_window",
-            new_callable=AsyncMock,
-        ) as mock_fetch:
-            mock_fetch.return_value = EventWindow(
-                start_time=datetime.utcnow() - timedelta(days=1),
-                end_time=datetime.utcnow(),
-                events=sample_events,
-            )
+        result = await workflow.run_anchor_job()
+
+        assert result.success
+        assert result.event_count == 2
+        assert result.anchor_id is not None
+
+        items = save_anchor_items.call_args.kwargs["items"]
+        assert [item[1] for item in items] == [
+            event.event_hash for event in sample_events
+        ]
 
-            with patch.object(
-                workflow._event_consumer,
-                "get_last_anchor_time",
-                new_callable=AsyncMock,
-            ) as mock_last:
-                mock_last.return_value = None
-
-                with patch.object(
-                    workflow._repository,
-                    "save_anchor",
-                    new_callable=AsyncMock,
-                ) as mock_save:
-                    mock_save.return_value = sample_anchor_record.id
-
-                    with patch.object(
-                        workflow._repository,
-                        "save_anchor_item",
-                        new_callable=AsyncMock,
-                    ):
-                        with patch.object(
-                            workflow,
-                            "_check_existing_anchor",
-                            new_callable=AsyncMock,
-                        ) as mock_check:
-                            mock_check.return_value = None
-
-                            result = await workflow.run_anchor_job()
-
-                            assert result.success
-                            assert result.event_count == 2
-                            assert result.anchor_id is not None
-
-    @pytest.mark.asyncio
     async def test_run_anchor_job_duplicate(
         self,
         mock_session: AsyncMock,
         mock_anchor_service: AsyncMock,
         sample_events: list[IndexedEvent],
         sample_anchor_record: AnchorRecord,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test anchor job with existing anchor (idempotency)."""
         workflow = AnchorWorkflow(mock_session, mock_anchor_service)
+        window = EventWindow(start_time=_YESTERDAY, end_time=_NOW, events=sample_events)
 
-        with patch.object(
-            workflow._event_consumer,
-            "fetch_events_for_window",
-            new_callable=AsyncMock,
-        ) as mock_fetch:
-            mock_fetch.return_value = EventWindow(
-                start_time=datetime.utcnow() - timedelta(days=1),
-                end_time=datetime.utcnow(),
-                events=sample_events,
-            )
-
-            with patch.object(
-                workflow._event_consumer,
-                "get_last_anchor_time",
-                new_callable=AsyncMock,
-            ) as mock_last:
-                mock_last.return_value = None
-
-                with patch.object(
-                    workflow,
-                    "_check_existing_anchor",
-                    new_callable=AsyncMock,
-                ) as mock_check:
-                    mock_check.return_value = sample_anchor_record
+        consumer = workflow._event_consumer
+        monkeypatch.setattr(consumer, "fetch_events_for_window", _async_return(window))
+        monkeypatch.setattr(consumer, "get_last_anchor_time", _async_return(None))
+        monkeypatch.setattr(
+            workflow, "_check_existing_anchor", _async_return(sample_anchor_record)
+        )
 
-                    result = await workflow.run_anchor_job()
+        result = await workflow.run_anchor_job()
 
-                    assert result.success
-                    assert result.event_count == 2
-                    # Should use existing anchor, not create new
+        assert result.success
+        assert result.event_count == 2
+        # Should use existing anchor, not create new
+        mock_anchor_service.create_anchor.assert_not_awaited()
 
-    @pytest.mark.asyncio
     async def test_run_daily_anchor(
         self,
         mock_session: AsyncMock,
@@ -265,24 +254,13 @@ class TestAnchorWorkflow:
             "run_anchor_job",
             new_callable=AsyncMock,
         ) as mock_run:
-            mock_run.return_value = AnchorResult(
-                success=True,
-                anchor_id=uuid4(),
-                digest="a" * 64,
-                event_count=100,
-                iota_block_id="0x123",
-                error=None,
-                start_time=datetime.utcnow() - timedelta(days=1),
-                end_time=datetime.utcnow(),
-                duration_seconds=10.0,
-            )
+            mock_run.return_value = _SAMPLE_DAILY_RESULT
 
             result = await workflow.run_daily_anchor()
 
             assert result.success
             mock_run.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_run_incremental_anchor_not_enough_events(
         self,
         mock_session: AsyncMock,
@@ -293,18 +271,15 @@ class TestAnchorWorkflow:
 
         with patch.object(
             workflow._event_consumer,
-            "get_last_anchor_time",
+            "get_anchor_context",
             new_callable=AsyncMock,
-        ) as mock_last:
-            mock_last.return_value = datetime.utcnow() - timedelta(hours=6)
-
-            with patch.object(
-                workflow._event_consumer,
-                "get_event_count_since",
-                new_callable=AsyncMock,
-            ) as mock_count:
-                mock_count.return_value = 50  # Less than min_events
+        ) as mock_context:
+            mock_context.return_value = (
+                _NOW - timedelta(hours=6),
+                50,  # Less than min_events
+            )
 
-                result = await workflow.run_incremental_anchor(min_events=100)
+            result = await workflow.run_incremental_anchor(min_events=100)
 
-                assert result is None
+            assert result is None
+            mock_context.assert_awaited_once()
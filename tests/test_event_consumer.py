@@ -0,0 +1,332 @@
+"""
+Unit tests for the Event Consumer.
+"""
+
+from collections.abc import AsyncIterator, Generator
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from app.services import event_consumer
+from app.services.event_consumer import (
+    EventConsumer,
+    IndexedEvent,
+    invalidate_anchor_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache() -> Generator[None, None, None]:
+    """Isolate tests from the module-level query cache."""
+    event_consumer._query_cache.clear()
+    yield
+    event_consumer._query_cache.clear()
+
+
+@pytest.fixture
+def mock_session() -> AsyncMock:
+    """Create a mock database session."""
+    return AsyncMock()
+
+
+def _result(**columns: object) -> MagicMock:
+    """Build a mock result whose fetchone() returns a single row."""
+    result = MagicMock()
+    result.fetchone.return_value = MagicMock(**columns)
+    return result
+
+
+class TestQueryCache:
+    """Tests for cached scheduler queries."""
+
+    async def test_last_anchor_time_cached(self, mock_session: AsyncMock) -> None:
+        """Test that repeated calls hit the database once."""
+        end_time = datetime(2025, 12, 1)
+        mock_session.execute.return_value = _result(end_time=end_time)
+        consumer = EventConsumer(mock_session)
+
+        assert await consumer.get_last_anchor_time() == end_time
+        assert await consumer.get_last_anchor_time() == end_time
+        assert mock_session.execute.await_count == 1
+
+    async def test_last_anchor_time_uncached(self, mock_session: AsyncMock) -> None:
+        """Test that an uncached read always queries and refreshes the cache."""
+        stale, latest = datetime(2025, 12, 1), datetime(2025, 12, 2)
+        mock_session.execute.side_effect = [
+            _result(end_time=stale),
+            _result(end_time=latest),
+        ]
+        consumer = EventConsumer(mock_session)
+        await consumer.get_last_anchor_time()
+
+        assert await consumer.get_last_anchor_time(use_cache=False) == latest
+        assert await consumer.get_last_anchor_time() == latest
+        assert mock_session.execute.await_count == 2
+
+    async def test_event_count_cached_per_since(self, mock_session: AsyncMock) -> None:
+        """Test that event counts are cached by start time."""
+        mock_session.execute.return_value = _result(count=42)
+        consumer = EventConsumer(mock_session)
+        since = datetime(2025, 12, 1)
+
+        assert await consumer.get_event_count_since(since) == 42
+        assert await consumer.get_event_count_since(since) == 42
+        await consumer.get_event_count_since(since + timedelta(hours=1))
+
+        assert mock_session.execute.await_count == 2
+
+    async def test_event_count_bucketed_to_seconds(
+        self, mock_session: AsyncMock
+    ) -> None:
+        """Test that sub-second differences in start time share a result."""
+        mock_session.execute.return_value = _result(count=42)
+        consumer = EventConsumer(mock_session)
+        since = datetime(2025, 12, 1, 0, 0, 0, 100)
+
+        await consumer.get_event_count_since(since)
+        await consumer.get_event_count_since(since.replace(microsecond=900))
+
+        assert mock_session.execute.await_count == 1
+
+    async def test_invalidate_anchor_cache(self, mock_session: AsyncMock) -> None:
+        """Test that invalidation forces a fresh query."""
+        mock_session.execute.return_value = _result(end_time=datetime(2025, 12, 1))
+        consumer = EventConsumer(mock_session)
+
+        await consumer.get_last_anchor_time()
+        invalidate_anchor_cache()
+        await consumer.get_last_anchor_time()
+
+        assert mock_session.execute.await_count == 2
+
+    async def test_record_anchor_writes_through(self, mock_session: AsyncMock) -> None:
+        """Test that a newer anchor replaces cached results."""
+        since = datetime(2025, 12, 1)
+        mock_session.execute.side_effect = [
+            _result(end_time=since),
+            _result(count=42),
+            _result(count=42),
+        ]
+        consumer = EventConsumer(mock_session)
+        await consumer.get_last_anchor_time()
+        await consumer.get_event_count_since(since)
+
+        consumer.record_anchor(since + timedelta(days=1))
+
+        assert await consumer.get_last_anchor_time() == since + timedelta(days=1)
+        await consumer.get_event_count_since(since)
+        assert mock_session.execute.await_count == 3
+
+    @pytest.mark.parametrize("cached", [True, False])
+    async def test_record_anchor_older_window_not_written(
+        self, mock_session: AsyncMock, cached: bool
+    ) -> None:
+        """Test that an older (or unknown) anchor end leaves the DB value."""
+        latest = datetime(2025, 12, 2)
+        mock_session.execute.return_value = _result(end_time=latest)
+        consumer = EventConsumer(mock_session)
+        if cached:
+            await consumer.get_last_anchor_time()
+
+        consumer.record_anchor(datetime(2025, 11, 1))
+
+        assert await consumer.get_last_anchor_time() == latest
+        assert mock_session.execute.await_count == (2 if cached else 1)
+
+    async def test_anchor_context_single_round_trip(
+        self, mock_session: AsyncMock
+    ) -> None:
+        """Test that the fused context query feeds the cache."""
+        last_time = datetime(2025, 12, 1)
+        mock_session.execute.return_value = _result(
+            last_anchor_time=last_time,
+            event_count=7,
+        )
+        consumer = EventConsumer(mock_session)
+
+        context = await consumer.get_anchor_context(datetime(2025, 11, 30))
+
+        assert context == (last_time, 7)
+        assert await consumer.get_anchor_context(datetime(2025, 11, 30)) == context
+        assert await consumer.get_event_count_since(last_time) == 7
+        assert mock_session.execute.await_count == 1
+
+    async def test_anchor_context_no_row(self, mock_session: AsyncMock) -> None:
+        """Test that a missing result row yields no anchor and no events."""
+        result = MagicMock()
+        result.fetchone.return_value = None
+        mock_session.execute.return_value = result
+        consumer = EventConsumer(mock_session)
+
+        assert await consumer.get_anchor_context(datetime(2025, 11, 30)) == (None, 0)
+
+    async def test_anchor_context_capped_count(self, mock_session: AsyncMock) -> None:
+        """Test that a capped count is not reused as an exact count."""
+        last_time = datetime(2025, 12, 1)
+        mock_session.execute.return_value = _result(
+            last_anchor_time=last_time,
+            event_count=100,
+        )
+        consumer = EventConsumer(mock_session)
+
+        context = await consumer.get_anchor_context(last_time, count_limit=100)
+        assert context == (last_time, 100)
+        assert mock_session.execute.await_args.args[1]["count_limit"] == 100
+
+        assert await consumer.get_anchor_context(last_time, count_limit=100) == context
+        assert mock_session.execute.await_count == 1
+
+        mock_session.execute.return_value = _result(count=250)
+        assert await consumer.get_event_count_since(last_time) == 250
+        assert mock_session.execute.await_count == 2
+
+
+class TestIndexedEvent:
+    """Tests for IndexedEvent serialization."""
+
+    def test_to_json_batch_matches_to_dict(self) -> None:
+        """Test that batch encoding yields the same fields as to_dict."""
+        events = [
+            IndexedEvent(
+                id=uuid4(),
+                block_number=100 + i,
+                block_hash="0x" + "a" * 64,
+                event_index=i,
+                pallet="TelemetryProofs",
+                event_name="ProofSubmitted",
+                event_data={"device_id": f"dev{i}"},
+                event_hash=f"{i:064x}",
+                timestamp=datetime(2025, 12, 1, 12, 0, 0, 123456),
+            )
+            for i in range(3)
+        ]
+
+        encoded = IndexedEvent.to_json_batch(events)
+
+        assert orjson.loads(encoded) == [event.to_dict() for event in events]
+
+
+class TestEventThreshold:
+    """Tests for bounded event counting."""
+
+    @pytest.mark.parametrize(("found", "expected"), [(10, True), (3, False)])
+    async def test_has_at_least_events_since(
+        self,
+        mock_session: AsyncMock,
+        found: int,
+        expected: bool,
+    ) -> None:
+        """Test that the bounded count is compared to the threshold."""
+        mock_session.execute.return_value = MagicMock(
+            scalar=MagicMock(return_value=found)
+        )
+        consumer = EventConsumer(mock_session)
+
+        assert (
+            await consumer.has_at_least_events_since(datetime(2025, 12, 1), 10)
+            is expected
+        )
+        assert mock_session.execute.await_args.args[1]["threshold"] == 10
+
+    async def test_uses_cached_exact_count(self, mock_session: AsyncMock) -> None:
+        """Test that a cached exact count answers without a query."""
+        mock_session.execute.return_value = _result(count=42)
+        consumer = EventConsumer(mock_session)
+        since = datetime(2025, 12, 1)
+        await consumer.get_event_count_since(since)
+
+        assert await consumer.has_at_least_events_since(since, 40)
+        assert not await consumer.has_at_least_events_since(since, 50)
+        assert mock_session.execute.await_count == 1
+
+
+class TestFetchEvents:
+    """Tests for event fetching."""
+
+    async def test_fetch_events_for_window(self, mock_session: AsyncMock) -> None:
+        """Test that streamed row mappings are unpacked into IndexedEvents."""
+        row = {
+            "id": uuid4(),
+            "block_number": 100,
+            "block_hash": "0x" + "a" * 64,
+            "event_index": 0,
+            "pallet": "TelemetryProofs",
+            "event_name": "ProofSubmitted",
+            "event_data": {},
+            "event_hash": "a" * 64,
+            "timestamp": datetime(2025, 12, 1, 12),
+        }
+
+        async def partitions() -> AsyncIterator[list[dict[str, object]]]:
+            yield [row]
+
+        result = MagicMock()
+        result.mappings.return_value.partitions = partitions
+        mock_session.stream.return_value = result
+        consumer = EventConsumer(mock_session)
+
+        window = await consumer.fetch_events_for_window(
+            start_time=datetime(2025, 12, 1),
+            end_time=datetime(2025, 12, 2),
+        )
+
+        assert window.event_hashes == ["a" * 64]
+        assert window.events[0].block_number == 100
+        assert consumer.last_block == 100
+
+    async def test_fetch_events_reuses_statements(
+        self,
+        mock_session: AsyncMock,
+    ) -> None:
+        """Test that the pallet filter selects a prebuilt statement."""
+
+        async def partitions() -> AsyncIterator[list[dict[str, object]]]:
+            return
+            yield
+
+        result = MagicMock()
+        result.mappings.return_value.partitions = partitions
+        mock_session.stream.return_value = result
+        consumer = EventConsumer(mock_session)
+
+        await consumer.fetch_events_for_window(
+            start_time=datetime(2025, 12, 1),
+            end_time=datetime(2025, 12, 2),
+        )
+        await consumer.fetch_events_for_window(
+            start_time=datetime(2025, 12, 1),
+            end_time=datetime(2025, 12, 2),
+            pallets=["TelemetryProofs"],
+        )
+
+        calls = mock_session.stream.await_args_list
+        assert [call.args[0] for call in calls] == [
+            event_consumer._Q_EVENTS,
+            event_consumer._Q_EVENTS_PALLETS,
+        ]
+        assert calls[1].args[1]["pallets"] == ["TelemetryProofs"]
+
+    async def test_fetch_events_without_data(self, mock_session: AsyncMock) -> None:
+        """Test that anchoring fetches skip the event payload column."""
+
+        async def partitions() -> AsyncIterator[list[dict[str, object]]]:
+            return
+            yield
+
+        result = MagicMock()
+        result.mappings.return_value.partitions = partitions
+        mock_session.stream.return_value = result
+        consumer = EventConsumer(mock_session)
+
+        await consumer.fetch_events_for_window(
+            start_time=datetime(2025, 12, 1),
+            end_time=datetime(2025, 12, 2),
+            include_data=False,
+        )
+
+        query = mock_session.stream.await_args.args[0]
+        assert query is event_consumer._Q_EVENT_KEYS
+        assert "COALESCE(event_data" not in query.text
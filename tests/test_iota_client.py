@@ -2,14 +2,21 @@
 Unit tests for the IOTA Client.
 """
 
+import hashlib
 import json
+import time
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
+from tenacity import wait_none
 
+from app.core.config import settings
 from app.services.iota_client import (
+    CONFIRMATION_POLL_BACKOFF,
+    CONFIRMATION_POLL_BASE_DELAY,
     AnchorMessage,
     BlockMetadata,
     ConfirmationError,
@@ -18,6 +25,7 @@ from app.services.iota_client import (
     IOTAClientError,
     MessageStatus,
     PostingError,
+    _confirmation_poll_delay,
 )
 
 
@@ -42,13 +50,69 @@ class TestAnchorMessage:
         assert parsed["type"] == "merkle_root"
         assert parsed["count"] == 100
 
-    def test_compute_hash(self, sample_anchor_message: AnchorMessage) -> None:
+    @pytest.mark.parametrize(
+        ("digest", "count"),
+        [("a" * 64, 1), ("b" * 64, 100), ("c" * 64, 10_000)],
+    )
+    def test_compute_hash(self, digest: str, count: int) -> None:
         """Test hash computation."""
-        hash1 = sample_anchor_message.compute_hash()
-        hash2 = sample_anchor_message.compute_hash()
-        
-        assert len(hash1) == 64  # SHA-256 hex
-        assert hash1 == hash2  # Deterministic
+
+        def build() -> AnchorMessage:
+            return AnchorMessage(
+                digest=digest,
+                digest_algorithm="sha256",
+                anchor_type="merkle_root",
+                timestamp=1764547200,
+                event_count=count,
+            )
+
+        message = build()
+        digest_hex = message.compute_hash()
+
+        assert len(digest_hex) == 64  # SHA-256 hex
+        assert digest_hex == hashlib.sha256(message.to_bytes()).hexdigest()
+        # Deterministic across instances, not just memoized per instance
+        assert build().compute_hash() == digest_hex
+
+    @pytest.mark.parametrize(
+        "metadata",
+        [{}, {"site": "Kigali", "operator": "Société Générale"}, {"ratio": 1e16}],
+    )
+    def test_to_bytes_matches_legacy_encoding(self, metadata: dict) -> None:
+        """Test that payload bytes match the original json.dumps encoding."""
+        message = AnchorMessage(
+            digest="a" * 64,
+            timestamp=1764547200,
+            event_count=3,
+            metadata=metadata,
+        )
+        legacy = {
+            "digest": "a" * 64,
+            "algorithm": "sha256",
+            "type": "merkle_root",
+            "ts": 1764547200,
+            "count": 3,
+            "start": 0,
+            "end": 0,
+            "v": "1.0",
+        }
+        if metadata:
+            legacy["meta"] = metadata
+
+        expected = json.dumps(legacy, separators=(",", ":")).encode("utf-8")
+        assert message.to_bytes() == expected
+
+    def test_to_bytes_is_memoized(self, sample_anchor_message: AnchorMessage) -> None:
+        """Test that serialization is computed once and reused."""
+        first = sample_anchor_message.to_bytes()
+        assert sample_anchor_message.to_bytes() is first
+        assert "_encoded" not in repr(sample_anchor_message)
+
+    def test_data_hex(self, sample_anchor_message: AnchorMessage) -> None:
+        """Test hex payload matches the bytes and is reused."""
+        data_hex = sample_anchor_message.data_hex
+        assert bytes.fromhex(data_hex) == sample_anchor_message.to_bytes()
+        assert sample_anchor_message.data_hex is data_hex
 
     def test_default_timestamp(self) -> None:
         """Test that timestamp defaults to now."""
@@ -59,6 +123,7 @@ class TestAnchorMessage:
             end_time=1,
         )
         assert msg.timestamp > 0
+        assert abs(msg.timestamp - time.time()) < 5
 
 
 class TestBlockMetadata:
@@ -78,6 +143,7 @@ class TestBlockMetadata:
             network="testnet",
         )
         assert meta.timestamp is not None
+        assert meta.timestamp.tzinfo is not None
 
 
 class TestIOTAClient:
@@ -89,40 +155,49 @@ class TestIOTAClient:
         assert iota_client.network == "testnet"
         assert not iota_client.is_connected
 
-    @pytest.mark.asyncio
-    async def test_connect_success(self, iota_client: IOTAClient) -> None:
+    async def test_connect_success(
+        self,
+        iota_client: IOTAClient,
+        patched_httpx: MagicMock,
+    ) -> None:
         """Test successful connection."""
-        with patch.object(iota_client, "_check_health", new_callable=AsyncMock) as mock_health:
-            mock_health.return_value = True
-            
-            with patch.object(iota_client, "_get_node_info", new_callable=AsyncMock) as mock_info:
-                mock_info.return_value = {
+        with (
+            patch.object(
+                iota_client,
+                "_check_health",
+                new_callable=AsyncMock,
+                return_value=True,
+            ),
+            patch.object(
+                iota_client,
+                "_get_node_info",
+                new_callable=AsyncMock,
+                return_value={
                     "version": "1.0.0",
                     "protocol": {"networkName": "shimmer-testnet"},
-                }
-                
-                with patch("httpx.AsyncClient") as mock_client_class:
-                    mock_client = AsyncMock()
-                    mock_client_class.return_value = mock_client
-                    
-                    await iota_client.connect()
-                    
-                    assert iota_client.is_connected
-
-    @pytest.mark.asyncio
-    async def test_connect_health_fail(self, iota_client: IOTAClient) -> None:
+                },
+            ),
+        ):
+            await iota_client.connect()
+
+        assert iota_client.is_connected
+        assert patched_httpx.call_args.kwargs["http2"] is True
+
+    async def test_connect_health_fail(
+        self,
+        iota_client: IOTAClient,
+        patched_httpx: MagicMock,
+    ) -> None:
         """Test connection failure on health check."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-            
-            with patch.object(iota_client, "_check_health", new_callable=AsyncMock) as mock_health:
-                mock_health.return_value = False
-                
-                with pytest.raises(ConnectionError):
-                    await iota_client.connect()
+        with patch.object(
+            iota_client,
+            "_check_health",
+            new_callable=AsyncMock,
+            return_value=False,
+        ):
+            with pytest.raises(ConnectionError):
+                await iota_client.connect()
 
-    @pytest.mark.asyncio
     async def test_disconnect(self, iota_client: IOTAClient) -> None:
         """Test disconnection."""
         iota_client._client = AsyncMock()
@@ -133,22 +208,26 @@ class TestIOTAClient:
         assert not iota_client.is_connected
         assert iota_client._client is None
 
-    @pytest.mark.asyncio
-    async def test_get_block_metadata(self, iota_client: IOTAClient) -> None:
+    async def test_get_block_metadata(
+        self,
+        iota_client: IOTAClient,
+        mock_httpx_client: AsyncMock,
+    ) -> None:
         """Test getting block metadata."""
-        iota_client._client = MagicMock()
+        iota_client._client = mock_httpx_client
         iota_client._connected = True
         
-        # Use MagicMock for response since .json() is sync in httpx
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "isSolid": True,
-            "referencedByMilestoneIndex": 12345,
-            "ledgerInclusionState": "included",
-        }
-        mock_response.raise_for_status = MagicMock()
-        iota_client._client.get = AsyncMock(return_value=mock_response)
+        # Plain value object: only the attributes the client reads
+        mock_httpx_client.get.return_value = SimpleNamespace(
+            status_code=200,
+            headers={},
+            json=lambda: {
+                "isSolid": True,
+                "referencedByMilestoneIndex": 12345,
+                "ledgerInclusionState": "included",
+            },
+            raise_for_status=lambda: None,
+        )
         
         metadata = await iota_client.get_block_metadata("0x123")
         
@@ -157,7 +236,33 @@ class TestIOTAClient:
         assert metadata.milestone_index == 12345
         assert metadata.ledger_inclusion_state == "included"
 
-    @pytest.mark.asyncio
+    async def test_get_block_metadata_not_modified(
+        self,
+        iota_client: IOTAClient,
+    ) -> None:
+        """Test repeat polls send validators and reuse metadata on 304."""
+        request = httpx.Request("GET", "https://node/api/core/v2/blocks/0x123/metadata")
+        iota_client._client = MagicMock()
+        iota_client._connected = True
+        iota_client._client.get = AsyncMock(
+            side_effect=[
+                httpx.Response(
+                    200,
+                    json={"isSolid": True},
+                    headers={"ETag": '"v1"'},
+                    request=request,
+                ),
+                httpx.Response(304, request=request),
+            ]
+        )
+
+        first = await iota_client.get_block_metadata("0x123")
+        second = await iota_client.get_block_metadata("0x123")
+
+        assert second is first
+        headers = iota_client._client.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"'}
+
     async def test_verify_block_exists(self, iota_client: IOTAClient) -> None:
         """Test block existence verification."""
         with patch.object(
@@ -175,7 +280,6 @@ class TestIOTAClient:
             
             assert exists
 
-    @pytest.mark.asyncio
     async def test_verify_block_not_exists(self, iota_client: IOTAClient) -> None:
         """Test block non-existence."""
         with patch.object(
@@ -189,6 +293,96 @@ class TestIOTAClient:
             
             assert not exists
 
+    async def test_wait_for_confirmation_backs_off(
+        self,
+        iota_client: IOTAClient,
+    ) -> None:
+        """Test confirmation polling sleeps with growing delays."""
+        pending = BlockMetadata(block_id="0x123", network="testnet")
+        included = BlockMetadata(
+            block_id="0x123",
+            network="testnet",
+            ledger_inclusion_state="included",
+        )
+
+        with patch.object(
+            iota_client,
+            "get_block_metadata",
+            new_callable=AsyncMock,
+        ) as mock_get:
+            mock_get.side_effect = [pending, IOTAClientError("busy"), pending, included]
+
+            with patch(
+                "app.services.iota_client.asyncio.sleep",
+                new_callable=AsyncMock,
+            ) as mock_sleep:
+                metadata = await iota_client._wait_for_confirmation("0x123", timeout=60)
+
+        assert metadata is included
+        delays = [call.args[0] for call in mock_sleep.await_args_list]
+        assert len(delays) == 3
+        assert delays == sorted(delays)
+
+    async def test_wait_for_confirmations(self, iota_client: IOTAClient) -> None:
+        """Test concurrent confirmation keeps input order."""
+        block_ids = ["0x1", "0x2", "0x3"]
+
+        async def confirm(block_id: str, timeout: int) -> BlockMetadata:
+            return BlockMetadata(block_id=block_id, network="testnet")
+
+        with patch.object(iota_client, "_wait_for_confirmation", side_effect=confirm):
+            results = await iota_client.wait_for_confirmations(block_ids, timeout=10)
+
+        assert [meta.block_id for meta in results] == block_ids
+
+    async def test_submit_tagged_data_block(
+        self,
+        iota_client: IOTAClient,
+        sample_anchor_message: AnchorMessage,
+    ) -> None:
+        """Test the submitted block carries the hex tag and message."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"blockId": "0xabc"}
+        mock_response.raise_for_status = MagicMock()
+        iota_client._client = MagicMock()
+        iota_client._client.post = AsyncMock(return_value=mock_response)
+
+        block_id = await iota_client._submit_tagged_data_block(sample_anchor_message)
+
+        assert block_id == "0xabc"
+        block = json.loads(iota_client._client.post.call_args.kwargs["content"])
+        payload = block["payload"]
+        assert bytes.fromhex(payload["tag"]) == b"ARED_ANCHOR_v1"
+        assert bytes.fromhex(payload["data"]) == sample_anchor_message.to_bytes()
+
+    async def test_submit_block_retries(
+        self,
+        iota_client: IOTAClient,
+        sample_anchor_message: AnchorMessage,
+    ) -> None:
+        """Test the shared retry policy is reused across submissions."""
+        iota_client._retry_config["wait"] = wait_none()
+
+        with patch.object(
+            iota_client,
+            "_submit_tagged_data_block",
+            new_callable=AsyncMock,
+        ) as mock_submit:
+            mock_submit.side_effect = [
+                httpx.ConnectError("reset"),
+                "0xabc",
+                httpx.ConnectError("reset"),
+                "0xdef",
+            ]
+
+            for block_id in ("0xabc", "0xdef"):
+                submitted = await iota_client._submit_block_with_retry(
+                    sample_anchor_message
+                )
+                assert submitted == block_id
+
+        assert mock_submit.await_count == 4
+
     def test_get_explorer_url(self, iota_client: IOTAClient) -> None:
         """Test explorer URL generation."""
         url = iota_client.get_explorer_url("0x123abc")
@@ -197,36 +391,48 @@ class TestIOTAClient:
         assert "block" in url
 
 
+class TestConfirmationPollDelay:
+    """Tests for confirmation polling backoff."""
+
+    @pytest.mark.parametrize("attempt", [0, 1, 2, 5])
+    def test_delay_within_jitter(self, attempt: int) -> None:
+        """Test delays grow exponentially within the jitter band."""
+        expected = CONFIRMATION_POLL_BASE_DELAY * CONFIRMATION_POLL_BACKOFF**attempt
+        delay = _confirmation_poll_delay(attempt)
+        assert expected * 0.8 <= delay <= expected * 1.2
+
+    def test_delay_capped(self) -> None:
+        """Test delays never exceed the configured poll interval."""
+        cap = settings.IOTA_CONFIRMATION_POLL_INTERVAL
+        assert _confirmation_poll_delay(50) <= cap * 1.2
+
+
 class TestMessageStatus:
     """Tests for MessageStatus enum."""
 
-    def test_values(self) -> None:
+    @pytest.mark.parametrize(
+        ("status", "value"),
+        [
+            (MessageStatus.PENDING, "pending"),
+            (MessageStatus.INCLUDED, "included"),
+            (MessageStatus.CONFLICTING, "conflicting"),
+            (MessageStatus.UNKNOWN, "unknown"),
+        ],
+    )
+    def test_values(self, status: MessageStatus, value: str) -> None:
         """Test enum values."""
-        assert MessageStatus.PENDING.value == "pending"
-        assert MessageStatus.INCLUDED.value == "included"
-        assert MessageStatus.CONFLICTING.value == "conflicting"
-        assert MessageStatus.UNKNOWN.value == "unknown"
+        assert status.value == value
 
 
 class TestExceptions:
     """Tests for exception classes."""
 
-    def test_iota_client_error(self) -> None:
-        """Test IOTAClientError."""
-        error = IOTAClientError("Test error")
-        assert str(error) == "Test error"
-
-    def test_connection_error(self) -> None:
-        """Test ConnectionError."""
-        error = ConnectionError("Connection failed")
-        assert isinstance(error, IOTAClientError)
-
-    def test_posting_error(self) -> None:
-        """Test PostingError."""
-        error = PostingError("Posting failed")
-        assert isinstance(error, IOTAClientError)
-
-    def test_confirmation_error(self) -> None:
-        """Test ConfirmationError."""
-        error = ConfirmationError("Confirmation timeout")
+    @pytest.mark.parametrize(
+        "exc_cls",
+        [IOTAClientError, ConnectionError, PostingError, ConfirmationError],
+    )
+    def test_is_iota_client_error(self, exc_cls: type[IOTAClientError]) -> None:
+        """Test that client errors share a base and keep their message."""
+        error = exc_cls("Test error")
         assert isinstance(error, IOTAClientError)
+        assert str(error) == "Test error"
@@ -9,6 +9,7 @@ import hashlib
 import pytest
 
 from app.crypto.merkle import (
+    HASH_ALGORITHMS,
     LEAF_PREFIX,
     NODE_PREFIX,
     MerkleProof,
@@ -16,10 +17,16 @@ from app.crypto.merkle import (
     ProofDirection,
     ProofElement,
     compute_leaf_hash,
+    compute_leaf_hash_bytes,
+    compute_leaf_hash_hex,
+    compute_leaf_hash_text,
     compute_parent_hash,
+    compute_parent_hash_raw,
     compute_root_from_proof,
+    get_hasher,
     verify_proof,
     verify_proof_against_root,
+    verify_proofs_batch,
 )
 
 
@@ -29,30 +36,47 @@ class TestHashFunctions:
     def test_compute_leaf_hash_bytes(self) -> None:
         """Test leaf hash computation with bytes input."""
         data = b"hello"
-        result = compute_leaf_hash(data)
+        result = compute_leaf_hash_bytes(data)
 
         # Verify manually
         expected = hashlib.sha256(LEAF_PREFIX + data).hexdigest()
         assert result == expected
 
-    def test_compute_leaf_hash_string(self) -> None:
-        """Test leaf hash computation with string input."""
+    def test_compute_leaf_hash_text(self) -> None:
+        """Test leaf hash computation with text input."""
         data = "hello"
-        result = compute_leaf_hash(data)
+        result = compute_leaf_hash_text(data)
 
         # String should be encoded to bytes
         expected = hashlib.sha256(LEAF_PREFIX + data.encode("utf-8")).hexdigest()
         assert result == expected
 
-    def test_compute_leaf_hash_hex_string(self) -> None:
-        """Test leaf hash computation with hex string."""
+    def test_compute_leaf_hash_hex(self) -> None:
+        """Test leaf hash computation with hex input."""
         hex_data = "deadbeef"
-        result = compute_leaf_hash(hex_data)
+        result = compute_leaf_hash_hex(hex_data)
 
         # Hex string should be converted to bytes
         expected = hashlib.sha256(LEAF_PREFIX + bytes.fromhex(hex_data)).hexdigest()
         assert result == expected
 
+    def test_compute_leaf_hash_text_keeps_hex_like_text(self) -> None:
+        """Test that text made of hex digits is still hashed as text."""
+        assert compute_leaf_hash_text("beef") != compute_leaf_hash_hex("beef")
+        assert compute_leaf_hash_text("beef") == compute_leaf_hash_bytes(b"beef")
+
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            (b"hello", compute_leaf_hash_bytes(b"hello")),
+            ("hello", compute_leaf_hash_text("hello")),
+            ("deadbeef", compute_leaf_hash_hex("deadbeef")),
+        ],
+    )
+    def test_compute_leaf_hash_dispatch(self, data: bytes | str, expected: str) -> None:
+        """Test that the generic function dispatches on the input type."""
+        assert compute_leaf_hash(data) == expected
+
     def test_compute_leaf_hash_deterministic(self) -> None:
         """Test that leaf hash is deterministic."""
         data = b"test data"
@@ -71,6 +95,16 @@ class TestHashFunctions:
         ).hexdigest()
         assert result == expected
 
+    def test_compute_parent_hash_raw(self) -> None:
+        """Test parent hash computation on raw digests."""
+        left = bytes.fromhex("a" * 64)
+        right = bytes.fromhex("b" * 64)
+
+        result = compute_parent_hash_raw(left, right)
+
+        assert result == hashlib.sha256(NODE_PREFIX + left + right).digest()
+        assert result.hex() == compute_parent_hash("a" * 64, "b" * 64)
+
     def test_compute_parent_hash_deterministic(self) -> None:
         """Test that parent hash is deterministic."""
         left = "a" * 64
@@ -91,6 +125,40 @@ class TestHashFunctions:
 
         assert leaf_hash != parent_hash
 
+    def test_unsupported_algorithm_raises(self) -> None:
+        """Test that unknown hash algorithms are rejected."""
+        with pytest.raises(ValueError):
+            get_hasher("md5")
+
+        with pytest.raises(ValueError):
+            MerkleTree.from_leaves([b"a", b"b"], algorithm="md5")
+
+
+@pytest.mark.skipif("blake3" not in HASH_ALGORITHMS, reason="blake3 not installed")
+class TestBlake3:
+    """Tests for BLAKE3 tree construction."""
+
+    def test_blake3_root_differs_from_sha256(self) -> None:
+        """Test that BLAKE3 and SHA-256 trees produce different roots."""
+        leaves = [b"a", b"b", b"c"]
+        sha_tree = MerkleTree.from_leaves(leaves)
+        blake_tree = MerkleTree.from_leaves(leaves, algorithm="blake3")
+
+        assert blake_tree.algorithm == "blake3"
+        assert blake_tree.root_hash != sha_tree.root_hash
+
+    def test_blake3_proofs_verify(self) -> None:
+        """Test that BLAKE3 proofs verify and round-trip."""
+        tree = MerkleTree.from_leaves(
+            [f"leaf{i}".encode() for i in range(7)],
+            algorithm="blake3",
+        )
+
+        for proof in tree.get_all_proofs():
+            assert proof.algorithm == "blake3"
+            assert verify_proof(proof)
+            assert verify_proof(MerkleProof.from_dict(proof.to_dict()))
+
 
 class TestMerkleTree:
     """Tests for MerkleTree construction."""
@@ -192,6 +260,11 @@ class TestMerkleTree:
         assert tree.get_leaf_hash(0) == hashes[0]
         assert tree.get_leaf_hash(1) == hashes[1]
 
+    def test_from_raw_hashes_wrong_length_raises(self) -> None:
+        """Test that raw hashes must be full-width digests."""
+        with pytest.raises(ValueError, match="32-byte"):
+            MerkleTree.from_raw_hashes([compute_leaf_hash(b"a"), "ab" * 16])
+
     def test_get_leaf_hash(self) -> None:
         """Test getting leaf hash by index."""
         tree = MerkleTree.from_leaves([b"a", b"b", b"c"])
@@ -225,6 +298,19 @@ class TestMerkleTree:
 
         assert tree1.root_hash != tree2.root_hash
 
+    def test_node_view(self) -> None:
+        """Test that the linked node view matches the stored hashes."""
+        tree = MerkleTree.from_leaves([b"a", b"b", b"c"])
+
+        assert tree.root.hash == tree.root_hash
+        assert tree.root.left is not None and tree.root.right is tree.leaves[2]
+        assert tree.root.left.hash == compute_parent_hash(
+            compute_leaf_hash(b"a"), compute_leaf_hash(b"b")
+        )
+        assert [leaf.data for leaf in tree.leaves] == [b"a", b"b", b"c"]
+        assert [leaf.position for leaf in tree.leaves] == [0, 1, 2]
+        assert all(leaf.is_leaf for leaf in tree.leaves)
+
 
 class TestProofGeneration:
     """Tests for proof generation."""
@@ -277,15 +363,43 @@ class TestProofGeneration:
         with pytest.raises(IndexError):
             tree.get_proof(5)
 
-    def test_get_all_proofs(self) -> None:
+    def test_get_all_proofs(self, merkle_trees: dict[int, MerkleTree]) -> None:
         """Test getting all proofs at once."""
-        tree = MerkleTree.from_leaves([b"a", b"b", b"c", b"d"])
+        tree = merkle_trees[4]
         proofs = tree.get_all_proofs()
 
         assert len(proofs) == 4
         for i, proof in enumerate(proofs):
             assert proof.leaf_index == i
 
+        # Leaves 0 and 1 both prove through the same right-hand subtree
+        assert proofs[0].proof_path[1] is proofs[1].proof_path[1]
+        assert proofs[0].proof_path is not proofs[1].proof_path
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 100])
+    def test_get_all_proofs_match_per_leaf(
+        self, merkle_trees: dict[int, MerkleTree], count: int
+    ) -> None:
+        """Test that the single-sweep proofs match per-leaf proofs."""
+        tree = merkle_trees[count]
+
+        proofs = tree.get_all_proofs()
+
+        assert [p.to_dict() for p in proofs] == [
+            tree.get_proof(i).to_dict() for i in range(count)
+        ]
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 100])
+    def test_get_all_compact_proofs(
+        self, merkle_trees: dict[int, MerkleTree], count: int
+    ) -> None:
+        """Test that the single-sweep compact proofs match per-leaf proofs."""
+        tree = merkle_trees[count]
+
+        compact = tree.get_all_compact_proofs()
+
+        assert compact == [tree.get_proof(i).to_compact() for i in range(count)]
+
 
 class TestProofVerification:
     """Tests for proof verification."""
@@ -312,26 +426,70 @@ class TestProofVerification:
             proof = tree.get_proof(i)
             assert verify_proof(proof), f"Proof for leaf {i} failed"
 
-    def test_verify_odd_leaves(self) -> None:
+    @pytest.mark.parametrize("count", [3, 5, 7, 9, 11])
+    def test_verify_odd_leaves(
+        self, merkle_trees: dict[int, MerkleTree], count: int
+    ) -> None:
         """Test verification for odd number of leaves."""
-        for count in [3, 5, 7, 9, 11]:
-            leaves = [f"leaf{i}".encode() for i in range(count)]
-            tree = MerkleTree.from_leaves(leaves)
+        tree = merkle_trees[count]
 
-            for i in range(count):
-                proof = tree.get_proof(i)
-                assert verify_proof(proof), f"Proof failed for leaf {i} in {count}-leaf tree"
+        for i in range(count):
+            proof = tree.get_proof(i)
+            assert verify_proof(proof), f"Proof failed for leaf {i}"
 
-    def test_verify_large_tree(self) -> None:
+    def test_verify_large_tree(self, merkle_trees: dict[int, MerkleTree]) -> None:
         """Test verification for larger tree."""
-        leaves = [f"data{i}".encode() for i in range(100)]
-        tree = MerkleTree.from_leaves(leaves)
+        tree = merkle_trees[100]
 
         # Verify random subset
         for i in [0, 25, 50, 75, 99]:
             proof = tree.get_proof(i)
             assert verify_proof(proof)
 
+    def test_cached_layer_proof_length(
+        self, merkle_trees: dict[int, MerkleTree]
+    ) -> None:
+        """Test that proofs ending at a cached layer drop the upper levels."""
+        tree = merkle_trees[100]
+        layer = tree.get_layer(3)
+
+        # Levels hold 100, 50, 25, 13, 7, 4, 2 and 1 nodes
+        assert len(layer) == 7
+        assert tree.get_layer(0) == [tree.root_hash]
+        for i in [0, 25, 50, 75, 99]:
+            full = tree.get_proof(i)
+            short = tree.get_proof(i, layer_depth=3)
+            assert short.proof_path == full.proof_path[: len(short.proof_path)]
+            assert len(full.proof_path) - len(short.proof_path) <= 3
+            assert short.layer_index == i >> 4
+
+    @pytest.mark.parametrize("count", [5, 11, 100])
+    def test_cached_layer_verifies(
+        self, merkle_trees: dict[int, MerkleTree], count: int
+    ) -> None:
+        """Test that layered proofs verify against the layer, not the root."""
+        tree = merkle_trees[count]
+        layer = tree.get_layer(2)
+        proofs = [tree.get_proof(i, layer_depth=2) for i in range(count)]
+
+        assert all(verify_proof(proof, layer) for proof in proofs)
+        assert all(verify_proofs_batch(proofs, layer))
+        assert not verify_proof(proofs[0])
+        assert not verify_proof(proofs[0], layer[::-1])
+        restored = MerkleProof.from_dict(proofs[-1].to_dict())
+        assert restored.layer_index == proofs[-1].layer_index
+        assert verify_proof(restored, layer)
+
+    def test_layer_depth_out_of_range_raises(self) -> None:
+        """Test that layers outside the tree are rejected."""
+        tree = MerkleTree.from_leaves([b"a", b"b", b"c", b"d"])
+
+        with pytest.raises(ValueError):
+            tree.get_layer(3)
+
+        with pytest.raises(ValueError):
+            tree.get_proof(0, layer_depth=-1)
+
     def test_verify_tampered_leaf_fails(self) -> None:
         """Test that tampered leaf hash fails verification."""
         tree = MerkleTree.from_leaves([b"a", b"b", b"c", b"d"])
@@ -368,6 +526,23 @@ class TestProofVerification:
 
         assert not verify_proof(tampered)
 
+    def test_verify_proofs_batch_matches_sequential(self) -> None:
+        """Test that batch verification matches verifying one by one."""
+        tree = MerkleTree.from_leaves([f"data{i}".encode() for i in range(1024)])
+        proofs = [tree.get_proof(i) for i in range(0, 1024, 16)]
+        proofs[3] = MerkleProof(
+            leaf_hash="0" * 64,
+            leaf_index=proofs[3].leaf_index,
+            proof_path=proofs[3].proof_path,
+            root_hash=proofs[3].root_hash,
+            tree_size=proofs[3].tree_size,
+        )
+
+        results = verify_proofs_batch(proofs)
+
+        assert results == [verify_proof(proof) for proof in proofs]
+        assert results.count(False) == 1 and not results[3]
+
     def test_verify_proof_against_root(self) -> None:
         """Test verification against specific root."""
         tree = MerkleTree.from_leaves([b"a", b"b"])
@@ -470,6 +645,19 @@ class TestProofElement:
         assert element.hash == "b" * 64
         assert element.direction == ProofDirection.RIGHT
 
+    def test_immutable(self) -> None:
+        """Test that elements cannot be modified once built."""
+        element = ProofElement(hash="d" * 64, direction=ProofDirection.RIGHT)
+
+        with pytest.raises(AttributeError):
+            element.hash = "e" * 64  # type: ignore[misc]
+
+    def test_to_dict_plain_string_direction(self) -> None:
+        """Test serialization when the direction is a plain string."""
+        element = ProofElement(hash="c" * 64, direction="L")
+
+        assert element.to_dict() == {"hash": "c" * 64, "direction": "L"}
+
 
 class TestKnownVectors:
     """Tests using known test vectors for interoperability."""
@@ -500,13 +688,28 @@ class TestKnownVectors:
         assert verify_proof(tree.get_proof(0))
         assert verify_proof(tree.get_proof(1))
 
-    def test_vector_power_of_two_leaves(self) -> None:
+    def test_vector_buffer_leaves(self) -> None:
+        """Test that memoryview leaves hash like the bytes they view."""
+        blob = b"x" * 10000 + b"small"
+        view = memoryview(blob)
+        leaves = [view[:10000], view[10000:]]
+
+        tree = MerkleTree.from_leaves(leaves)
+        expected = MerkleTree.from_leaves([b"x" * 10000, b"small"])
+
+        assert tree.root_hash == expected.root_hash
+        assert tree.leaves[1].data is leaves[1]
+        assert compute_leaf_hash_bytes(view[10000:]) == compute_leaf_hash(b"small")
+
+    @pytest.mark.parametrize("count", [2, 4, 8, 16, 32])
+    def test_vector_power_of_two_leaves(
+        self, merkle_trees: dict[int, MerkleTree], count: int
+    ) -> None:
         """Test with power-of-two leaf counts."""
-        for count in [2, 4, 8, 16, 32]:
-            leaves = [f"leaf{i}".encode() for i in range(count)]
-            tree = MerkleTree.from_leaves(leaves)
-            for i in range(count):
-                assert verify_proof(tree.get_proof(i))
+        tree = merkle_trees[count]
+
+        for i in range(count):
+            assert verify_proof(tree.get_proof(i))
 
     def test_consistency_across_constructions(self) -> None:
         """Test that different construction methods yield same root."""
@@ -0,0 +1,517 @@
+"""
+Unit tests for the Reconciliation Service.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Generator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.anchor_service import (
+    AnchorRecord,
+    AnchorService,
+    AnchorServiceError,
+    AnchorStatus,
+)
+from app.services import reconciliation as reconciliation_module
+from app.services.reconciliation import (
+    CIRCUIT_OPEN,
+    PENDING_ANCHORS,
+    CircuitBreaker,
+    ReconciliationService,
+    RetryStats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator[None, None, None]:
+    """Isolate tests from the module-level retry cache."""
+    reconciliation_module._retry_stats_cache.clear()
+    yield
+    reconciliation_module._retry_stats_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(monkeypatch: pytest.MonkeyPatch) -> CircuitBreaker:
+    """Give each test a closed circuit breaker."""
+    breaker = CircuitBreaker(fail_threshold=2, recovery_timeout=30.0)
+    monkeypatch.setattr(reconciliation_module, "_iota_breaker", breaker)
+    return breaker
+
+
+@pytest.fixture
+def mock_session() -> AsyncMock:
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    return session
+
+
+@pytest.fixture
+def reconciliation(mock_session: AsyncMock) -> ReconciliationService:
+    """Create a reconciliation service with mocked dependencies."""
+    return ReconciliationService(
+        session=mock_session,
+        anchor_service=AsyncMock(spec=AnchorService),
+        retry_delay_base=60.0,
+        retry_delay_max=600.0,
+    )
+
+
+class TestBackoff:
+    """Tests for retry backoff."""
+
+    @pytest.mark.parametrize(("retry_count", "cap"), [(0, 60), (1, 120), (5, 600)])
+    def test_full_jitter_within_cap(
+        self,
+        reconciliation: ReconciliationService,
+        retry_count: int,
+        cap: float,
+    ) -> None:
+        """Test that sampled delays stay within the exponential ceiling."""
+        delays = [reconciliation._calculate_backoff(retry_count) for _ in range(200)]
+
+        assert reconciliation._backoff_cap(retry_count) == cap
+        assert all(0 <= delay <= cap for delay in delays)
+        assert len(set(delays)) > 1
+
+
+    def test_delay_schedule_stops_at_cap(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that ceilings beyond the table stay at the maximum."""
+        assert reconciliation._delay_schedule == (60, 120, 240, 480, 600)
+        assert reconciliation._backoff_cap(50) == 600
+
+
+class TestRetryStats:
+    """Tests for batched retry history."""
+
+    async def test_load_retry_stats_single_query(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that retry history for a batch is loaded in one round trip."""
+        anchor_ids = [uuid4(), uuid4()]
+        last_attempt = datetime(2025, 12, 1, tzinfo=UTC)
+        reconciliation._session.execute.return_value = [
+            MagicMock(
+                anchor_id=anchor_ids[0],
+                retries=2,
+                last_attempt=last_attempt,
+                next_retry_at=None,
+            )
+        ]
+
+        stats = await reconciliation._load_retry_stats(anchor_ids)
+
+        reconciliation._session.execute.assert_awaited_once()
+        query = reconciliation._session.execute.await_args.args[0]
+        assert query is reconciliation_module._Q_RETRY_STATS
+        assert stats == {
+            anchor_ids[0]: RetryStats(2, last_attempt, None),
+            anchor_ids[1]: RetryStats(),
+        }
+        assert reconciliation._next_retry_time(stats[anchor_ids[0]]) == (
+            last_attempt + timedelta(seconds=240)
+        )
+
+    async def test_load_retry_stats_cached(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that cached history, including empty history, skips the query."""
+        anchor_ids = [uuid4(), uuid4()]
+        reconciliation._session.execute.return_value = []
+        await reconciliation._load_retry_stats(anchor_ids[:1])
+
+        reconciliation._record_retry_attempt(anchor_ids[1], delay=30.0, retries=3)
+        stats = await reconciliation._load_retry_stats(anchor_ids)
+
+        reconciliation._session.execute.assert_awaited_once()
+        assert stats[anchor_ids[0]] == RetryStats()
+        assert stats[anchor_ids[1]].retries == 3
+
+    async def test_failed_flush_invalidates_cache(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that attempts which were not persisted are not cached."""
+        anchor_id = uuid4()
+        reconciliation._record_retry_attempt(anchor_id, delay=30.0, retries=1)
+        reconciliation._session.execute.side_effect = RuntimeError
+
+        await reconciliation._flush_retry_log()
+
+        assert anchor_id not in reconciliation_module._retry_stats_cache
+
+    async def test_load_retry_stats_empty(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that an empty batch skips the query."""
+        assert await reconciliation._load_retry_stats([]) == {}
+        reconciliation._session.execute.assert_not_awaited()
+
+
+class TestPendingAnchors:
+    """Tests for pending anchor retries."""
+
+    async def test_waits_for_stored_next_retry(
+        self,
+        reconciliation: ReconciliationService,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that the persisted retry time gates the next attempt."""
+        stats = {
+            sample_anchor_record.id: RetryStats(
+                retries=1,
+                last_attempt=datetime.now(UTC),
+                next_retry_at=datetime.now(UTC) + timedelta(minutes=5),
+            )
+        }
+
+        with patch.object(reconciliation, "_retry_anchor") as mock_retry:
+            status = await reconciliation._process_pending_anchor(
+                sample_anchor_record, stats, datetime.now(UTC)
+            )
+
+        assert status == "pending"
+        mock_retry.assert_not_awaited()
+
+    async def test_records_sampled_delay(
+        self,
+        reconciliation: ReconciliationService,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that a retry persists the delay it sampled."""
+        with patch.object(reconciliation, "_calculate_backoff", return_value=90.0):
+            await reconciliation._retry_anchor(sample_anchor_record, retry_count=0)
+
+        [row] = reconciliation._pending_retry_log
+        assert row["anchor_id"] == sample_anchor_record.id
+        assert row["next_retry_at"] - row["created_at"] == timedelta(seconds=90)
+
+    async def test_retry_log_flushed_once(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that recorded attempts are inserted in one batch and commit."""
+        reconciliation._record_retry_attempt(uuid4(), delay=30.0, retries=1)
+        reconciliation._record_retry_attempt(uuid4(), delay=60.0, retries=2)
+
+        await reconciliation._flush_retry_log()
+
+        reconciliation._session.execute.assert_awaited_once()
+        query, rows = reconciliation._session.execute.await_args.args
+        assert query is reconciliation_module._INSERT_RETRY_LOG
+        assert len(rows) == 2
+        reconciliation._session.commit.assert_awaited_once()
+        assert reconciliation._pending_retry_log == []
+
+
+class TestCircuitBreaker:
+    """Tests for the IOTA circuit breaker."""
+
+    def test_opens_after_threshold_and_recovers(self) -> None:
+        """Test the closed, open and half-open transitions."""
+        breaker = CircuitBreaker(fail_threshold=2, recovery_timeout=30.0)
+
+        breaker.record_failure()
+        assert not breaker.is_open()
+        breaker.record_failure()
+        assert breaker.is_open()
+        assert CIRCUIT_OPEN._value.get() == 1
+
+        with patch.object(
+            reconciliation_module.time, "monotonic", return_value=time.monotonic() + 31
+        ):
+            assert not breaker.is_open()
+
+        breaker.record_success()
+        assert not breaker.is_open()
+        assert CIRCUIT_OPEN._value.get() == 0
+
+    async def test_retries_skipped_while_open(
+        self,
+        reconciliation: ReconciliationService,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that failed posts trip the breaker and later anchors wait."""
+        reconciliation._anchor_service.create_anchor.side_effect = (
+            AnchorServiceError("node down")
+        )
+        anchors = [replace(sample_anchor_record, id=uuid4()) for _ in range(3)]
+        now = datetime.now(UTC)
+
+        outcomes = [
+            await reconciliation._process_pending_anchor(anchor, {}, now)
+            for anchor in anchors
+        ]
+
+        assert outcomes == ["failed", "failed", "pending"]
+        assert reconciliation._anchor_service.create_anchor.await_count == 2
+
+
+class TestConfirmationChecks:
+    """Tests for posted anchor confirmation checks."""
+
+    @pytest.mark.parametrize(
+        ("status", "guarded"),
+        [(AnchorStatus.CONFIRMED, True), (AnchorStatus.FAILED, False)],
+    )
+    async def test_confirmation_written_once(
+        self,
+        mock_session: AsyncMock,
+        status: AnchorStatus,
+        guarded: bool,
+    ) -> None:
+        """Test that confirming skips anchors already stored as confirmed."""
+        repository = reconciliation_module.AnchorRepository(mock_session)
+
+        await repository.update_anchor_status(uuid4(), status, commit=False)
+
+        query, params = mock_session.execute.await_args.args
+        assert ("AND status <> :status" in str(query)) is guarded
+        assert params["status"] == status
+
+
+class TestProcessConcurrently:
+    """Tests for bounded concurrent processing."""
+
+    async def test_errors_reported_as_failed(
+        self,
+        reconciliation: ReconciliationService,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that a handler error becomes a "failed" outcome."""
+        anchors = [replace(sample_anchor_record, id=uuid4()) for _ in range(2)]
+
+        async def handler(anchor: AnchorRecord) -> str:
+            if anchor is anchors[0]:
+                raise RuntimeError("boom")
+            return "confirmed"
+
+        outcomes = await reconciliation._process_concurrently(anchors, handler)
+
+        assert outcomes == ["failed", "confirmed"]
+
+    async def test_cancellation_propagates(
+        self,
+        reconciliation: ReconciliationService,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that a cancelled handler is re-raised, not tallied."""
+        anchors = [replace(sample_anchor_record, id=uuid4()) for _ in range(2)]
+
+        async def handler(anchor: AnchorRecord) -> str:
+            if anchor is anchors[1]:
+                raise asyncio.CancelledError
+            return "confirmed"
+
+        with pytest.raises(asyncio.CancelledError):
+            await reconciliation._process_concurrently(anchors, handler)
+
+
+class TestRunReconciliation:
+    """Tests for the reconciliation cycle."""
+
+    async def test_buckets_processed_concurrently(
+        self,
+        mock_session: AsyncMock,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that anchors overlap up to the limit and outcomes are tallied.
+
+        Gauges report the full backlog, not the size of the processed batch.
+        """
+        reconciliation = ReconciliationService(
+            session=mock_session,
+            anchor_service=AsyncMock(spec=AnchorService),
+            concurrency=3,
+        )
+        posted = [replace(sample_anchor_record, id=uuid4()) for _ in range(6)]
+        pending = [replace(sample_anchor_record, id=uuid4()) for _ in range(2)]
+        buckets = {
+            AnchorStatus.POSTED: posted,
+            AnchorStatus.FAILED: [],
+        }
+        in_flight = 0
+        peak = 0
+
+        async def check(anchor: AnchorRecord) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "confirmed"
+
+        async def retry(anchor: AnchorRecord, stats: dict, now: datetime) -> str:
+            assert stats[anchor.id] == RetryStats()
+            if anchor is pending[0]:
+                raise RuntimeError("boom")
+            return "retried"
+
+        with (
+            patch.object(
+                reconciliation,
+                "_get_anchors_by_status",
+                side_effect=lambda status, after=None: buckets[status],
+            ),
+            patch.object(
+                reconciliation_module.AnchorRepository,
+                "list_due_anchors",
+                return_value=[(anchor, 0, None, None) for anchor in pending],
+            ),
+            patch.object(
+                reconciliation_module.AnchorRepository,
+                "count_anchors",
+                side_effect=lambda status: {
+                    AnchorStatus.PENDING: 250,
+                    AnchorStatus.FAILED: 0,
+                }[status],
+            ),
+            patch.object(reconciliation, "_load_retry_stats", return_value={}),
+            patch.object(reconciliation, "_check_confirmation", side_effect=check),
+            patch.object(reconciliation, "_process_pending_anchor", side_effect=retry),
+        ):
+            result = await reconciliation.run_reconciliation()
+
+        assert peak == 3
+        assert PENDING_ANCHORS._value.get() == 250
+        assert result.processed == 8
+        assert result.confirmed == 6
+        assert result.retried == 1
+        assert result.failed == 1
+
+    async def test_bucket_reads_overlap(
+        self,
+        reconciliation: ReconciliationService,
+    ) -> None:
+        """Test that the bucket reads run concurrently on separate sessions."""
+        in_flight = 0
+        peak = 0
+        sessions = set()
+
+        def read(result: object) -> Callable[..., Awaitable[object]]:
+            async def query(repository: object, **kwargs: object) -> object:
+                nonlocal in_flight, peak
+                sessions.add(id(repository._session))
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                return result
+
+            return query
+
+        with (
+            patch.object(
+                reconciliation_module.AnchorRepository,
+                "list_due_anchors",
+                read([]),
+            ),
+            patch.object(
+                reconciliation_module.AnchorRepository, "list_anchors_page", read([])
+            ),
+            patch.object(
+                reconciliation_module.AnchorRepository, "count_anchors", read(0)
+            ),
+        ):
+            await reconciliation.run_reconciliation()
+
+        assert peak == 5
+        assert len(sessions) == 5
+        assert id(reconciliation._session) not in sessions
+
+    async def test_buckets_walked_in_pages(
+        self,
+        mock_session: AsyncMock,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that a bucket larger than a page is processed in full."""
+        reconciliation = ReconciliationService(
+            session=mock_session,
+            anchor_service=AsyncMock(spec=AnchorService),
+            page_size=2,
+        )
+        start = datetime(2025, 12, 1, tzinfo=UTC)
+        posted = [
+            replace(sample_anchor_record, id=uuid4(), created_at=start + timedelta(i))
+            for i in range(5)
+        ]
+        cursors = []
+
+        async def page(
+            status: AnchorStatus, after: tuple[datetime, object] | None = None
+        ) -> list[AnchorRecord]:
+            if status != AnchorStatus.POSTED:
+                return []
+            cursors.append(after)
+            created = [anchor.created_at for anchor in posted]
+            offset = 0 if after is None else created.index(after[0]) + 1
+            return posted[offset : offset + 2]
+
+        with (
+            patch.object(reconciliation, "_get_anchors_by_status", side_effect=page),
+            patch.object(reconciliation, "_list_due_anchors", return_value=[]),
+            patch.object(reconciliation, "_read", return_value=0),
+            patch.object(
+                reconciliation, "_check_confirmation", return_value="confirmed"
+            ) as mock_check,
+        ):
+            result = await reconciliation.run_reconciliation()
+
+        assert result.confirmed == 5
+        assert mock_session.commit.await_count == 3
+        assert [call.args[0] for call in mock_check.await_args_list] == posted
+        assert cursors == [
+            None,
+            (posted[1].created_at, posted[1].id),
+            (posted[3].created_at, posted[3].id),
+        ]
+
+    async def test_unconfirmed_block_rechecked_each_cycle(
+        self,
+        mock_session: AsyncMock,
+        sample_anchor_record: AnchorRecord,
+    ) -> None:
+        """Test that a block still unconfirmed is polled again next cycle."""
+        anchor = replace(
+            sample_anchor_record, status=AnchorStatus.POSTED, iota_block_id="0xabc"
+        )
+        anchor_service = AsyncMock(spec=AnchorService)
+        anchor_service.check_confirmation.side_effect = [
+            anchor,
+            replace(anchor, status=AnchorStatus.CONFIRMED),
+        ]
+
+        async def page(
+            status: AnchorStatus, after: tuple[datetime, object] | None = None
+        ) -> list[AnchorRecord]:
+            return [anchor] if status == AnchorStatus.POSTED and after is None else []
+
+        results = []
+        for _ in range(2):
+            # main.py builds a fresh service for every scheduled cycle
+            reconciliation = ReconciliationService(
+                session=mock_session, anchor_service=anchor_service
+            )
+            with (
+                patch.object(
+                    reconciliation, "_get_anchors_by_status", side_effect=page
+                ),
+                patch.object(reconciliation, "_list_due_anchors", return_value=[]),
+                patch.object(reconciliation, "_read", return_value=0),
+            ):
+                results.append(await reconciliation.run_reconciliation())
+
+        assert anchor_service.check_confirmation.await_count == 2
+        assert [result.confirmed for result in results] == [0, 1]